@@ -1,22 +1,32 @@
 import json
 import re
 from datetime import datetime
+from typing import List
 
 from agency_swarm import Agent
 from agency_swarm.tools import CodeInterpreter, FileSearch
 from shared_tools.MarkdownWriter import MarkdownWriter
 from .tools.SerpAPISearch import SerpAPISearch
+from .tools.MultiQuerySearch import MultiQuerySearch
 
 
 class BrowsingAgent(Agent):
     SCREENSHOT_FILE_NAME = "screenshot.jpg"
 
+    # CSS selectors for the '[highlight ...]' commands, matched by ClickElement, SendKeys and SelectDropdown
+    HIGHLIGHT_SELECTORS = {
+        "clickable elements": "a, button, div[onclick], div[role='button'], div[tabindex], "
+                              "span[onclick], span[role='button'], span[tabindex]",
+        "text fields": "input, textarea",
+        "dropdowns": "select",
+    }
+
     def __init__(self):
         super().__init__(
             name="BrowsingAgent",
             description="Performs web searches and browsing using SerpAPI",
             instructions="./instructions.md",
-            tools=[CodeInterpreter, FileSearch, MarkdownWriter, SerpAPISearch],
+            tools=[CodeInterpreter, FileSearch, MarkdownWriter, SerpAPISearch, MultiQuerySearch],
             temperature=0.7,
             max_prompt_tokens=4000
         )
@@ -71,21 +81,71 @@ class BrowsingAgent(Agent):
         except Exception as e:
             return f"Error performing web search: {str(e)}"
 
+    def search_web_batch(self, queries: List[str], search_type: str = "search", report_name: str = "batch", **params):
+        """
+        Run several searches concurrently and save the merged, deduplicated results as a single report
+        """
+        try:
+            search_results = MultiQuerySearch(
+                queries=queries,
+                search_type=search_type,
+                parameters={"hl": "en", "gl": "us", "num": 10, **params},
+            ).run()
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = f"./reports/searches/{report_name.lower().replace(' ', '_')}_{timestamp}.md"
+
+            MarkdownWriter(
+                content=search_results,
+                file_path=report_path,
+                metadata={
+                    "queries": queries,
+                    "search_type": search_type,
+                    "parameters": params,
+                    "timestamp": timestamp
+                }
+            ).run()
+
+            return search_results
+
+        except Exception as e:
+            return f"Error performing batch web search: {str(e)}"
+
     def take_screenshot(self):
         from .tools.util.selenium import get_web_driver
-        from .tools.util import get_b64_screenshot
-        wd = get_web_driver()
-        screenshot = get_b64_screenshot(wd)
-        screenshot_data = base64.b64decode(screenshot)
+        from .tools.util.screenshots import capture_screenshot
+        wd = get_web_driver(self, profile="full")
+        self._screenshot = capture_screenshot(wd)
         with open(self.SCREENSHOT_FILE_NAME, "wb") as screenshot_file:
-            screenshot_file.write(screenshot_data)
+            screenshot_file.write(self._screenshot["data"])
+
+    def highlight_elements(self, element_type: str = "clickable elements"):
+        """
+        Numbers the visible elements of the given type on the current page and returns one line per element
+        (number, tag, text), so the element can be picked without reading the labels off a screenshot.
+        """
+        from .tools.util.selenium import get_web_driver
+        from .tools.util.highlights import index_elements_with_labels
+        selector = self.HIGHLIGHT_SELECTORS[element_type]
+        wd = get_web_driver(self)
+        element_index = index_elements_with_labels(wd, selector)
+
+        if self.shared_state is not None:
+            self.shared_state.set("elements_highlighted", selector)
+            self.shared_state.set("element_index", element_index)
+
+        return "\n".join(
+            f"[{entry['index']}] <{entry['tag']}> {entry['text']}" for entry in element_index
+        ) or f"No visible {element_type} on the page."
 
     def create_response_content(self, response_text):
-        with open(self.SCREENSHOT_FILE_NAME, "rb") as file:
-            file_id = self.client.files.create(
-                file=file,
-                purpose="vision",
-            ).id
+        from .tools.util.screenshots import get_screenshot_uploader
+        screenshot = getattr(self, "_screenshot", None)
+        if screenshot is None:
+            with open(self.SCREENSHOT_FILE_NAME, "rb") as screenshot_file:
+                screenshot = {"data": screenshot_file.read(), "format": "jpeg"}
+        # Unchanged frames reuse the file id of the earlier upload
+        file_id = get_screenshot_uploader().upload(screenshot["data"], screenshot["format"])["file_id"]
 
         content = [
             {"type": "text", "text": response_text},
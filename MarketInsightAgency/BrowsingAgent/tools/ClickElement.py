@@ -1,11 +1,9 @@
-import time
-
 from pydantic import Field
-from selenium.webdriver.common.by import By
 
 from agency_swarm.tools import BaseTool
 from .util import get_web_driver, set_web_driver
-from .util.highlights import remove_highlight_and_labels
+from .util.highlights import get_highlighted_element, remove_highlight_and_labels
+from .util.waits import format_wait, wait_for_page_ready
 
 
 class ClickElement(BaseTool):
@@ -20,29 +18,28 @@ class ClickElement(BaseTool):
     )
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent)
 
         if 'button' not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError("Please highlight clickable elements on the page first by outputting '[highlight clickable elements]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot.")
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, '.highlighted-element')
-
-        # iterate through all elements with a number in the text
         try:
-            element_text = all_elements[self.element_number - 1].text
+            # Resolved through the index built when the elements were highlighted, without re-querying the page
+            element, entry = get_highlighted_element(wd, self.element_number)
+            element_text = entry.get("text") if entry else element.text
             element_text = element_text.strip() if element_text else ""
-            # Subtract 1 because sequence numbers start at 1, but list indices start at 0
+            previous_url = wd.current_url
             try:
-                all_elements[self.element_number - 1].click()
+                element.click()
             except Exception as e:
                 if "element click intercepted" in str(e).lower():
-                    wd.execute_script("arguments[0].click();", all_elements[self.element_number - 1])
+                    wd.execute_script("arguments[0].click();", element)
                 else:
                     raise e
 
-            time.sleep(3)
+            wait = wait_for_page_ready(wd, step="ClickElement", previous_url=previous_url)
 
-            result = f"Clicked on element {self.element_number}. Text on clicked element: '{element_text}'. Current URL is {wd.current_url} To further analyze the page, output '[send screenshot]' command."
+            result = f"Clicked on element {self.element_number}. Text on clicked element: '{element_text}'. Current URL is {wd.current_url} {format_wait(wait)} To further analyze the page, output '[send screenshot]' command."
         except IndexError:
             result = "Element number is invalid. Please try again with a valid element number."
         except Exception as e:
@@ -55,5 +52,6 @@ class ClickElement(BaseTool):
         set_web_driver(wd)
 
         self._shared_state.set("elements_highlighted", "")
+        self._shared_state.set("page_text", None)
 
         return result
\ No newline at end of file
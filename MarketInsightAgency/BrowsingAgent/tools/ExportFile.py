@@ -1,17 +1,50 @@
 import base64
+import math
 import os
+import tempfile
+import time
 
 from agency_swarm.tools import BaseTool
+from shared_tools.llm_gateway import get_llm_gateway
+from shared_tools.metrics import BYTES_BUCKETS, registry
 from .util import get_web_driver
 
+# Default export settings, overridable through environment variables
+export_config = {
+    # Bytes requested per IO.read call
+    "chunk_size": int(os.getenv("PDF_EXPORT_CHUNK_SIZE", 1024 * 1024)),
+    # Exports larger than this are aborted (the Files API rejects very large files anyway)
+    "max_bytes": int(os.getenv("PDF_EXPORT_MAX_BYTES", 100 * 1024 * 1024)),
+}
+
+
+def stream_pdf(wd, file, params):
+    """
+    Prints the current page with Page.printToPDF in stream mode and writes it to file chunk by chunk with IO.read,
+    so the document is never held in memory as a whole. Returns the number of bytes written.
+    Raises ValueError when the document exceeds max_bytes.
+    """
+    handle = wd.execute_cdp_cmd('Page.printToPDF', {**params, 'transferMode': 'ReturnAsStream'})['stream']
+    size = 0
+    try:
+        while True:
+            chunk = wd.execute_cdp_cmd('IO.read', {'handle': handle, 'size': export_config["chunk_size"]})
+            data = base64.b64decode(chunk['data']) if chunk.get('base64Encoded') else chunk['data'].encode('latin-1')
+            size += len(data)
+            if size > export_config["max_bytes"]:
+                raise ValueError(f"PDF is larger than {export_config['max_bytes'] / (1024 * 1024):g} MB")
+            file.write(data)
+            if chunk.get('eof'):
+                return size
+    finally:
+        wd.execute_cdp_cmd('IO.close', {'handle': handle})
+
 
 class ExportFile(BaseTool):
     """This tool converts the current full web page into a file and returns its file_id. You can then send this file id back to the user for further processing."""
 
     def run(self):
-        wd = get_web_driver()
-        from agency_swarm import get_openai_client
-        client = get_openai_client()
+        wd = get_web_driver(self._caller_agent, profile="full")
 
         # Define the parameters for the PDF
         params = {
@@ -21,17 +54,32 @@ class ExportFile(BaseTool):
             'preferCSSPageSize': True,
         }
 
-        # Execute the command to print to PDF
-        result = wd.execute_cdp_cmd('Page.printToPDF', params)
-        pdf = result['data']
-
-        pdf_bytes = base64.b64decode(pdf)
+        # A unique file per export, so concurrent sessions do not overwrite each other's PDF
+        with tempfile.NamedTemporaryFile(prefix="exported_file_", suffix=".pdf", delete=False) as f:
+            path = f.name
+            try:
+                start = time.perf_counter()
+                size = stream_pdf(wd, f, params)
+                export_time = time.perf_counter() - start
+            except Exception as e:
+                f.close()
+                os.remove(path)
+                registry.inc("pdf_exports_total", outcome="error")
+                return f"Error exporting file: {str(e)}"
 
-        # Save the PDF to a file
-        with open("exported_file.pdf", "wb") as f:
-            f.write(pdf_bytes)
+        try:
+            start = time.perf_counter()
+            file_id = get_llm_gateway().upload_file(path, purpose="assistants")
+            upload_time = time.perf_counter() - start
+        finally:
+            os.remove(path)
 
-        file_id = client.files.create(file=open("exported_file.pdf", "rb"), purpose="assistants",).id
+        registry.inc("pdf_exports_total", outcome="success")
+        registry.observe("pdf_export_bytes", size, buckets=BYTES_BUCKETS)
+        registry.observe("pdf_export_seconds", export_time, phase="print")
+        registry.observe("pdf_export_seconds", upload_time, phase="upload")
+        registry.observe("pdf_export_mb_per_second", size / (1024 * 1024) / max(export_time, 1e-6),
+                         buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, math.inf))
 
         self._shared_state.set("file_id", file_id)
 
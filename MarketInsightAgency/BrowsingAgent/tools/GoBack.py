@@ -1,8 +1,7 @@
-import time
-
 from agency_swarm.tools import BaseTool
 
 from .util.selenium import get_web_driver, set_web_driver
+from .util.waits import format_wait, wait_for_page_ready
 
 
 class GoBack(BaseTool):
@@ -11,12 +10,16 @@ class GoBack(BaseTool):
     """
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent)
+
+        previous_url = wd.current_url
 
         wd.back()
 
-        time.sleep(3)
+        wait = wait_for_page_ready(wd, step="GoBack", previous_url=previous_url)
 
         set_web_driver(wd)
 
-        return "Success. Went back 1 page. Current URL is: " + wd.current_url
+        self._shared_state.set("page_text", None)
+
+        return "Success. Went back 1 page. Current URL is: " + wd.current_url + " " + format_wait(wait)
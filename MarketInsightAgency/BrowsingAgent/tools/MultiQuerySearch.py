@@ -0,0 +1,159 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from agency_swarm.tools import BaseTool
+from pydantic import Field
+
+from shared_tools.metrics import registry
+from shared_tools.urls import canonicalize_url
+from .SerpAPISearch import SerpAPISearch
+
+# Default batch search settings, overridable through environment variables
+multi_search_config = {
+    "max_concurrency": int(os.getenv("MULTI_SEARCH_MAX_CONCURRENCY", 5)),
+    # Reciprocal rank fusion constant; larger values flatten the advantage of top positions
+    "rrf_k": int(os.getenv("MULTI_SEARCH_RRF_K", 60)),
+}
+
+
+class MultiQuerySearch(BaseTool):
+    """
+    Runs several related Google searches at once and merges their organic results into one ranked list.
+    Links that appear under several queries (ignoring tracking parameters, "www." and letter case) are listed
+    once, ranked higher, and show which queries found them. Use this instead of calling SerpAPISearch repeatedly
+    when researching a topic from several angles.
+    """
+
+    queries: List[str] = Field(
+        ...,
+        description="The search queries to run, e.g. different phrasings or sub-topics of the research question"
+    )
+    search_type: str = Field(
+        default="search",
+        description="Type of search (search, images, news, shopping, etc.)"
+    )
+    parameters: Dict[str, Any] = Field(
+        default_factory=lambda: {
+            "hl": "en",
+            "gl": "us",
+            "num": 10
+        },
+        description="Additional search parameters applied to every query (location, language, etc.)"
+    )
+    max_results: int = Field(
+        default=30,
+        description="Maximum number of merged results to return"
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        description="Maximum number of searches running at once. Defaults to MULTI_SEARCH_MAX_CONCURRENCY."
+    )
+
+    def run(self) -> str:
+        try:
+            searches = self.search_all()
+            results = merge_results(searches, multi_search_config["rrf_k"])
+            return self._format_output(searches, results)
+
+        except Exception as e:
+            return f"Error performing multi-query search: {str(e)}"
+
+    def search_all(self) -> List[Dict[str, Any]]:
+        """
+        Runs every (unique) query concurrently and returns one entry per query with its organic results,
+        error (if any) and duration in seconds, in query order.
+        """
+        queries = list(dict.fromkeys(query.strip() for query in self.queries if query.strip()))
+        max_concurrency = max(1, self.max_concurrency or multi_search_config["max_concurrency"])
+
+        def search(query: str) -> Dict[str, Any]:
+            start = time.perf_counter()
+            entry = {"query": query, "results": [], "error": None}
+            try:
+                data = SerpAPISearch(query=query, search_type=self.search_type, parameters=self.parameters).search()
+                entry["results"] = data.get("organic_results", [])
+            except Exception as e:
+                entry["error"] = str(e)
+            entry["duration"] = time.perf_counter() - start
+            registry.observe("multi_search_query_seconds", entry["duration"],
+                             status="error" if entry["error"] else "ok")
+            return entry
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(queries) or 1),
+                                thread_name_prefix="multi-search") as executor:
+            return list(executor.map(search, queries))
+
+    def _format_output(self, searches: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> str:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        total = sum(len(search["results"]) for search in searches)
+        shown = results[:self.max_results]
+
+        output = f"""# Multi-Query Search Results
+Generated: {timestamp}
+
+## Queries
+| # | Query | Results | Time (s) | Status |
+|---|---|---|---|---|
+"""
+        for index, search in enumerate(searches, 1):
+            status = f"error: {search['error']}" if search["error"] else "ok"
+            output += f"| {index} | {search['query']} | {len(search['results'])} | {search['duration']:.2f} | {status} |\n"
+
+        wall_time = max((search["duration"] for search in searches), default=0.0)
+        sequential_time = sum(search["duration"] for search in searches)
+        output += (f"\n{total} results, {len(results)} unique links after deduplication. "
+                   f"Slowest query {wall_time:.1f}s, all queries {sequential_time:.1f}s combined.\n")
+
+        output += "\n## Merged Results\n"
+        for index, result in enumerate(shown, 1):
+            found_by = ", ".join(f"{source['query']} (#{source['rank']})" for source in result["sources"])
+            output += f"\n### {index}. {result['title']}\n"
+            output += f"Link: {result['link']}\n"
+            output += f"Snippet: {result['snippet']}\n"
+            output += f"Found by: {found_by}\n"
+        if len(results) > len(shown):
+            output += f"\n{len(results) - len(shown)} more results not shown.\n"
+
+        return output
+
+
+def merge_results(searches: List[Dict[str, Any]], rrf_k: int = 60) -> List[Dict[str, Any]]:
+    """
+    Merges the organic results of several searches by canonical URL. Each link scores the sum of
+    1 / (rrf_k + rank) over the queries that returned it (reciprocal rank fusion), so links found by several
+    queries and near the top rank first. Every merged result keeps its sources as (query, rank) pairs and the
+    title and snippet of its best-ranked appearance.
+    """
+    merged = {}
+    for search in searches:
+        for rank, item in enumerate(search["results"], 1):
+            link = item.get("link")
+            if not link:
+                continue
+            key = canonicalize_url(link)
+            result = merged.get(key)
+            if result is None:
+                result = merged[key] = {"url": key, "link": link, "title": item.get("title", "No Title"),
+                                        "snippet": item.get("snippet", "No Snippet"), "score": 0.0,
+                                        "best_rank": rank, "sources": []}
+            elif rank < result["best_rank"]:
+                result.update(link=link, title=item.get("title", result["title"]),
+                              snippet=item.get("snippet", result["snippet"]), best_rank=rank)
+            result["score"] += 1.0 / (rrf_k + rank)
+            result["sources"].append({"query": search["query"], "rank": rank})
+
+    return sorted(merged.values(), key=lambda result: (-result["score"], result["best_rank"]))
+
+
+if __name__ == "__main__":
+    tool = MultiQuerySearch(
+        queries=[
+            "project management software market size",
+            "project management tools market share 2024",
+            "top project management software competitors",
+        ]
+    )
+    print(tool.run())
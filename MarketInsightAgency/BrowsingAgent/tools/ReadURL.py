@@ -3,7 +3,10 @@ import time
 from pydantic import Field
 
 from agency_swarm.tools import BaseTool
-from .util.selenium import get_web_driver, set_web_driver
+from shared_tools.metrics import registry
+from .util.http_fetch import fetch_page_text
+from .util.selenium import apply_browsing_profile, get_web_driver, set_web_driver
+from .util.waits import format_wait, wait_for_page_ready
 
 
 class ReadURL(BaseTool):
@@ -21,22 +24,59 @@ Note: This tool only supports opening one URL at a time. The previous URL will b
     url: str = Field(
         ..., description="URL of the webpage.", examples=["https://google.com/search?q=search"]
     )
+    text_only: bool = Field(
+        default=False,
+        description="Set to true when you only need to read or summarize the text of the page. The page is fetched without the browser when possible, and otherwise loaded without images, fonts, media and ads, which is much faster. Keep false if you need a screenshot of the page or want to interact with it."
+    )
 
     class ToolConfig:
         one_call_at_a_time: bool = True
 
     def run(self):
-        wd = get_web_driver()
+        start = time.perf_counter()
+        fallback_reason = None
+
+        # Tier 1: plain HTTP fetch and main-content extraction, no browser involved
+        if self.text_only:
+            page = fetch_page_text(self.url)
+            if page["browser_reason"] is None:
+                self._record_tier("http", start)
+                self._shared_state.set("page_text", {
+                    "url": page["url"], "title": page["title"], "text": page["text"],
+                    "tier": "http", "fetch_time": page["fetch_time"],
+                })
+                return (f"Read {page['url']} over HTTP in {page['fetch_time']:.2f}s without opening the browser (tier: http).\n"
+                        f"Title: {page['title']}\n"
+                        "Use the WebPageSummarizer tool to read the page text. To interact with the page or take a screenshot, "
+                        "open it again with text_only set to false.")
+            fallback_reason = page["browser_reason"]
+
+        # Tier 2: render the page in the browser
+        wd = get_web_driver(self._caller_agent)
+
+        # The profile is switched before navigating, so there is nothing to reload
+        apply_browsing_profile(wd, "text" if self.text_only else "full", reload=False)
 
         wd.get(self.url)
 
-        time.sleep(2)
+        wait = wait_for_page_ready(wd, step="ReadURL")
 
         set_web_driver(wd)
 
+        self._record_tier("browser", start)
+        self._shared_state.set("page_text", None)
         self._shared_state.set("elements_highlighted", "")
 
-        return "Current URL is: " + wd.current_url + "\n" + "Please output '[send screenshot]' next to analyze the current web page or '[highlight clickable elements]' for further navigation."
+        if self.text_only:
+            return ("Current URL is: " + wd.current_url + "\n" + format_wait(wait) + "\n"
+                    + f"Opened in the browser (tier: browser) in {time.perf_counter() - start:.2f}s because the HTTP fast path was not enough: {fallback_reason}.\n"
+                    + "The page was loaded without images and media. Use the WebPageSummarizer tool to read it.")
+
+        return "Current URL is: " + wd.current_url + "\n" + format_wait(wait) + "\n" + "Please output '[send screenshot]' next to analyze the current web page or '[highlight clickable elements]' for further navigation."
+
+    def _record_tier(self, tier: str, start: float):
+        registry.observe("read_url_seconds", time.perf_counter() - start, tier=tier)
+        registry.inc("read_url_tier_total", tier=tier)
 
 
 if __name__ == "__main__":
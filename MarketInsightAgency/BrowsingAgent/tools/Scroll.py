@@ -4,6 +4,7 @@ from pydantic import Field
 
 from agency_swarm.tools import BaseTool
 from .util.selenium import get_web_driver, set_web_driver
+from .util.waits import format_wait, wait_for_page_ready
 
 
 class Scroll(BaseTool):
@@ -15,7 +16,7 @@ class Scroll(BaseTool):
     )
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent)
 
         height = wd.get_window_size()['height']
 
@@ -37,7 +38,8 @@ class Scroll(BaseTool):
                 result = "Reached the top of the page. Cannot scroll up any further.\n"
             else:
                 wd.execute_script(f"window.scrollBy(0, -{adjusted_height});")
-                result = "Scrolled up by 1 screen height. Make sure to output '[send screenshot]' command to analyze the page after scrolling."
+                wait = wait_for_page_ready(wd, step="Scroll")
+                result = f"Scrolled up by 1 screen height. {format_wait(wait)} Make sure to output '[send screenshot]' command to analyze the page after scrolling."
 
         elif self.direction == "down":
             if current_scroll_position + adjusted_height >= total_scroll_height:
@@ -45,7 +47,9 @@ class Scroll(BaseTool):
                 result = "Reached the bottom of the page. Cannot scroll down any further.\n"
             else:
                 wd.execute_script(f"window.scrollBy(0, {adjusted_height});")
-                result = "Scrolled down by 1 screen height. Make sure to output '[send screenshot]' command to analyze the page after scrolling."
+                # Lazily loaded content is fetched once it scrolls into view
+                wait = wait_for_page_ready(wd, step="Scroll")
+                result = f"Scrolled down by 1 screen height. {format_wait(wait)} Make sure to output '[send screenshot]' command to analyze the page after scrolling."
 
         set_web_driver(wd)
 
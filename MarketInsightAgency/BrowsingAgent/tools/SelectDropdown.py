@@ -1,11 +1,11 @@
 from typing import Dict
 from pydantic import Field, model_validator
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 
 from agency_swarm.tools import BaseTool
 from .util import get_web_driver, set_web_driver
-from .util.highlights import remove_highlight_and_labels
+from .util.highlights import get_highlighted_element, remove_highlight_and_labels
+from .util.waits import format_wait, wait_for_page_ready
 
 
 class SelectDropdown(BaseTool):
@@ -31,23 +31,23 @@ class SelectDropdown(BaseTool):
         return data
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent)
 
         if 'select' not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError("Please highlight dropdown elements on the page first by outputting '[highlight dropdowns]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot.")
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, '.highlighted-element')
-
         try:
             for key, value in self.key_value_pairs.items():
                 key = int(key)
-                element = all_elements[key - 1]
+                element, _ = get_highlighted_element(wd, key)
 
                 select = Select(element)
 
                 # Select the first option (index 0)
                 select.select_by_index(int(value))
-            result = f"Success. Option is selected in the dropdown. To further analyze the page, output '[send screenshot]' command."
+            # Selecting an option can trigger a reload or dynamic content
+            wait = wait_for_page_ready(wd, step="SelectDropdown")
+            result = f"Success. Option is selected in the dropdown. {format_wait(wait)} To further analyze the page, output '[send screenshot]' command."
         except Exception as e:
             result = str(e)
 
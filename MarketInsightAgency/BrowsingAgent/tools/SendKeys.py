@@ -1,13 +1,12 @@
-import time
 from typing import Dict
 
 from pydantic import Field
 from selenium.webdriver import Keys
-from selenium.webdriver.common.by import By
 
 from agency_swarm.tools import BaseTool
 from .util import get_web_driver, set_web_driver
-from .util.highlights import remove_highlight_and_labels
+from .util.highlights import get_highlighted_element, remove_highlight_and_labels
+from .util.waits import format_wait, wait_for_page_ready
 
 
 from pydantic import model_validator
@@ -37,17 +36,16 @@ class SendKeys(BaseTool):
         return data
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent)
         if 'input' not in self._shared_state.get("elements_highlighted", ""):
             raise ValueError("Please highlight input elements on the page first by outputting '[highlight text fields]' message. You must output just the message without calling the tool first, so the user can respond with the screenshot.")
 
-        all_elements = wd.find_elements(By.CSS_SELECTOR, '.highlighted-element')
-
         i = 0
+        wait = None
         try:
             for key, value in self.elements_and_texts.items():
                 key = int(key)
-                element = all_elements[key - 1]
+                element, _ = get_highlighted_element(wd, key)
 
                 try:
                     element.click()
@@ -59,10 +57,11 @@ class SendKeys(BaseTool):
                 element.send_keys(value)
                 # send enter key to the last element
                 if i == len(self.elements_and_texts) - 1:
+                    previous_url = wd.current_url
                     element.send_keys(Keys.RETURN)
-                    time.sleep(3)
+                    wait = wait_for_page_ready(wd, step="SendKeys", previous_url=previous_url)
                 i += 1
-            result = f"Sent input to element and pressed Enter. Current URL is {wd.current_url} To further analyze the page, output '[send screenshot]' command."
+            result = f"Sent input to element and pressed Enter. Current URL is {wd.current_url} {format_wait(wait) if wait else ''} To further analyze the page, output '[send screenshot]' command."
         except Exception as e:
             result = str(e)
 
@@ -70,4 +69,6 @@ class SendKeys(BaseTool):
 
         set_web_driver(wd)
 
+        self._shared_state.set("page_text", None)
+
         return result
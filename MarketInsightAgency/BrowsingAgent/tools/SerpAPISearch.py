@@ -1,9 +1,95 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-from typing import Optional, Dict, Any, List
-import requests
+from typing import Optional, Dict, Any, List, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import json
+import os
+import threading
+import time
 from datetime import datetime
 
+from shared_tools.http_client import get_http_client
+from shared_tools.metrics import registry
+from shared_tools.response_cache import get_response_cache
+from shared_tools.urls import canonicalize_url
+
+SERPAPI_URL = "https://serpapi.com/search"
+
+# Result cache settings, overridable through environment variables
+serp_cache_config = {
+    "enabled": os.getenv("SERP_CACHE_ENABLED", "true").lower() not in ("0", "false", "no"),
+    "max_entries": int(os.getenv("SERP_CACHE_MAX_ENTRIES", 2000)),
+    # Seconds results stay fresh by search_type; other types use "default"
+    "ttl": {
+        "news": int(os.getenv("SERP_CACHE_TTL_NEWS", 15 * 60)),
+        "shopping": int(os.getenv("SERP_CACHE_TTL_SHOPPING", 6 * 60 * 60)),
+        "default": int(os.getenv("SERP_CACHE_TTL", 24 * 60 * 60)),
+    },
+    # Seconds past its TTL (capped at the TTL itself) an entry is still served while it is refreshed in the background
+    "stale_ttl": int(os.getenv("SERP_CACHE_STALE_TTL", 60 * 60)),
+}
+
+# Default pagination settings, overridable through environment variables
+pagination_config = {
+    # Upper bound on results iter_results() yields when no budget is given
+    "max_results": int(os.getenv("SERP_MAX_RESULTS", 100)),
+    # Fetch the next page in the background while the current one is consumed
+    "prefetch": os.getenv("SERP_PREFETCH", "true").lower() not in ("0", "false", "no"),
+}
+
+# Keys being refreshed in the background, so a burst of stale hits triggers one request
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_serpapi_key() -> str:
+    """SerpAPI key from SERPAPI_API_KEY (or SERP_API_KEY, as in .env), read when a search is made."""
+    api_key = os.getenv("SERPAPI_API_KEY") or os.getenv("SERP_API_KEY")
+    if not api_key:
+        raise ValueError("SERPAPI_API_KEY is not set. Add your SerpAPI key to the environment or the .env file.")
+    return api_key
+
+
+def make_serp_cache_key(params: Dict[str, Any]) -> str:
+    """
+    Key for a SerpAPI request: the query lowercased with whitespace collapsed, plus the engine and all other
+    parameters (except the API key) sorted and compared as strings, so num=10 and num="10" match.
+    """
+    normalized = {key: str(value).strip() for key, value in params.items() if key != "api_key"}
+    normalized["q"] = " ".join(normalized.get("q", "").lower().split())
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_serp_cache():
+    return get_response_cache("serp", max_entries=serp_cache_config["max_entries"])
+
+
+def fetch_serp_results(params: Dict[str, Any]) -> Dict[str, Any]:
+    response = get_http_client().get(SERPAPI_URL, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+def _refresh(params: Dict[str, Any], key: str):
+    try:
+        get_serp_cache().set(key, fetch_serp_results(params))
+    except Exception as e:
+        print(f"Error refreshing cached search results: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def revalidate_in_background(params: Dict[str, Any], key: str):
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    threading.Thread(target=_refresh, args=(params, key), daemon=True).start()
+
+
 class SerpAPISearch(BaseTool):
     """
     Tool for performing Google searches using SerpAPI.
@@ -28,33 +114,130 @@ class SerpAPISearch(BaseTool):
         description="Additional search parameters (location, language, etc.)"
     )
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        self.api_key = "ab5994a0325d006f6567d50536425e38ed348e96bb7db92be50c07adb92e7dd3"
-        self.base_url = "https://serpapi.com/search"
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse recent results for the same search. Set to False to force fresh results."
+    )
+
+    max_results: Optional[int] = Field(
+        default=None,
+        description="Number of organic results to collect across result pages. Leave empty for a single page."
+    )
 
     def run(self) -> str:
         try:
-            # Prepare search parameters
-            params = {
-                "api_key": self.api_key,
-                "q": self.query,
-                "engine": "google",
-                **self.parameters
-            }
-
-            # Make API request
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self.search()
+            if self.max_results:
+                # Later pages only add organic results; the rest of the output comes from the first page
+                results = self.iter_results(max_results=self.max_results, first_page=data)
+                data = {**data, "organic_results": list(results)}
 
-            # Format results
+            # Format the (possibly cached) raw results so the output matches a fresh search
             formatted_output = self._format_search_results(data)
             return formatted_output
 
         except Exception as e:
             return f"Error performing search: {str(e)}"
 
+    def search(self, **extra_params) -> Dict[str, Any]:
+        """
+        Returns the raw SerpAPI results for this search, from the result cache when possible.
+        extra_params (e.g. start) are added to the request and to the cache key.
+        """
+        # Prepare search parameters
+        params = {
+            "api_key": get_serpapi_key(),
+            "q": self.query,
+            "engine": "google",
+            **self.parameters,
+            **extra_params
+        }
+
+        use_cache = self.use_cache and serp_cache_config["enabled"]
+        data = self._get_cached(params) if use_cache else None
+
+        if data is None:
+            # Make API request
+            data = fetch_serp_results(params)
+            if use_cache:
+                get_serp_cache().set(make_serp_cache_key(params), data)
+
+        return data
+
+    def iter_results(self, max_results: Optional[int] = None, start: int = 0,
+                     first_page: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields organic results page by page from offset start, fetching a page (via the start parameter)
+        only when the consumer reaches it, while the following page is prefetched in the background.
+        Links already yielded are skipped. Stops after max_results results, when a page has no new links
+        (SerpAPI repeats the last page past the end) or when there is no next page. Pages go through the
+        result cache, so iterating the same search again, or resuming it from a later start, is cheap.
+        first_page is a response for the first page already at hand (from search()), used instead of fetching it.
+        """
+        budget = max_results or pagination_config["max_results"]
+        page_size = int(self.parameters.get("num", 10)) or 10
+        seen = set()
+        yielded = 0
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serp-prefetch")
+
+        try:
+            offset = start
+            if first_page is not None and not start:
+                next_page = Future()
+                next_page.set_result(first_page)
+            else:
+                next_page = executor.submit(self._search_page, offset)
+            while yielded < budget:
+                wait_start = time.perf_counter()
+                data = next_page.result()
+                registry.observe("serp_page_wait_seconds", time.perf_counter() - wait_start)
+
+                results = data.get("organic_results", [])
+                has_next = bool(results) and "next" in data.get("serpapi_pagination", {})
+                offset += page_size
+                if has_next and pagination_config["prefetch"] and yielded + len(results) < budget:
+                    next_page = executor.submit(self._search_page, offset)
+                else:
+                    next_page = None
+
+                new_results = 0
+                for item in results:
+                    key = canonicalize_url(item.get("link", "")) or item.get("title")
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    new_results += 1
+                    yield item
+                    yielded += 1
+                    if yielded >= budget:
+                        return
+
+                if not has_next or not new_results:
+                    return
+                if next_page is None:
+                    next_page = executor.submit(self._search_page, offset)
+        finally:
+            # A prefetch still running finishes in the background and lands in the cache
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search_page(self, offset: int) -> Dict[str, Any]:
+        # The first page is requested without start, so it shares its cache entry with search()
+        return self.search(start=offset) if offset else self.search()
+
+    def _get_cached(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached raw results for params, refreshing them in the background when they are stale."""
+        key = make_serp_cache_key(params)
+        ttl = serp_cache_config["ttl"].get(self.search_type, serp_cache_config["ttl"]["default"])
+        entry = get_serp_cache().lookup(key, ttl=ttl, stale_ttl=min(serp_cache_config["stale_ttl"], ttl))
+
+        if entry is None:
+            registry.inc("serp_cache_requests_total", outcome="miss", search_type=self.search_type)
+            return None
+        if entry["stale"]:
+            revalidate_in_background(params, key)
+        registry.inc("serp_cache_requests_total", outcome="stale" if entry["stale"] else "hit", search_type=self.search_type)
+        return entry["payload"]
+
     def _format_search_results(self, data: Dict) -> str:
         """Format search results in a readable way"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1,24 +1,56 @@
 import base64
 import time
+from typing import Literal
 
+from pydantic import Field
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import presence_of_element_located, \
     frame_to_be_available_and_switch_to_it
 from selenium.webdriver.support.wait import WebDriverWait
 
 from agency_swarm.tools import BaseTool
-from .util import get_b64_screenshot, remove_highlight_and_labels
+from .util import remove_highlight_and_labels
 from .util.selenium import get_web_driver
-from agency_swarm.util import get_openai_client
+from .util.screenshots import screenshot_config, slice_image
+from .util.waits import wait_for_page_ready
+from shared_tools.llm_gateway import get_llm_gateway
+from shared_tools.metrics import registry
+
+# Grid element, selectable tiles (with boxes relative to the grid) and instructions of the image challenge,
+# read in one round trip
+GRID_SCRIPT = """
+var grid = document.getElementById('rc-imageselect-target');
+var gridRect = grid.getBoundingClientRect();
+var tiles = Array.prototype.filter.call(document.getElementsByClassName('rc-imageselect-tile'), function(tile) {
+    return !tile.className.endsWith('rc-imageselect-dynamic-selected');
+});
+var instructions = document.getElementsByClassName('rc-imageselect-instructions')[0];
+return {
+    grid: grid,
+    gridWidth: gridRect.width,
+    tiles: tiles,
+    boxes: tiles.map(function(tile) {
+        var rect = tile.getBoundingClientRect();
+        return [rect.left - gridRect.left, rect.top - gridRect.top, rect.width, rect.height];
+    }),
+    instructions: instructions ? instructions.innerText : ''
+};
+"""
 
 
 class SolveCaptcha(BaseTool):
     """
     This tool asks a human to solve captcha on the current webpage. Make sure that captcha is visible before running it.
     """
+    capture_mode: Literal["grid", "composite", "tiles"] = Field(
+        "grid",
+        description="How the challenge images are captured: 'grid' screenshots the grid once and cuts it into tiles, "
+                    "'composite' sends the whole grid as one numbered image (fewest tokens), 'tiles' screenshots "
+                    "every tile separately."
+    )
 
     def run(self):
-        wd = get_web_driver()
+        wd = get_web_driver(self._caller_agent, profile="full")
 
         try:
             WebDriverWait(wd, 10).until(
@@ -34,7 +66,6 @@ class SolveCaptcha(BaseTool):
         try:
             # Scroll the element into view
             wd.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)  # Give some time for the scrolling to complete
 
             # Click the element using JavaScript
             wd.execute_script("arguments[0].click();", element)
@@ -54,52 +85,26 @@ class SolveCaptcha(BaseTool):
 
         wd.switch_to.default_content()
 
-        client = get_openai_client()
-
         WebDriverWait(wd, 10).until(
             frame_to_be_available_and_switch_to_it(
                 (By.XPATH, "//iframe[@title='recaptcha challenge expires in two minutes']"))
         )
 
-        time.sleep(2)
+        # Wait for the challenge images to load
+        wait_for_page_ready(wd, step="SolveCaptcha")
 
         attempts = 0
         while attempts < 5:
-            tiles = wd.find_elements(By.CLASS_NAME, "rc-imageselect-tile")
-
-            # filter out tiles with rc-imageselect-dynamic-selected class
-            tiles = [tile for tile in tiles if
-                     not tile.get_attribute("class").endswith("rc-imageselect-dynamic-selected")]
-
-            image_content = []
-            i = 0
-            for tile in tiles:
-                i += 1
-                screenshot = get_b64_screenshot(wd, tile)
-
-                image_content.append(
-                    {
-                        "type": "text",
-                        "text": f"Image {i}:",
-                    }
-                )
-                image_content.append(
-                    {
-                        "type": "image_url",
-                        "image_url":
-                            {
-                                "url": f"data:image/jpeg;base64,{screenshot}",
-                                "detail": "high",
-                            }
-                    },
-                )
-            # highlight all titles with rc-imageselect-tile class but not with rc-imageselect-dynamic-selected
-            # wd = highlight_elements_with_labels(wd, 'td.rc-imageselect-tile:not(.rc-imageselect-dynamic-selected)')
-
-            # screenshot = get_b64_screenshot(wd, wd.find_element(By.ID, "rc-imageselect"))
-
-            task_text = wd.find_element(By.CLASS_NAME, "rc-imageselect-instructions").text.strip().replace("\n",
-                                                                                                           " ")
+            timings = {}
+            phase_start = time.perf_counter()
+            challenge = wd.execute_script(GRID_SCRIPT)
+            tiles = challenge["tiles"]
+            timings["locate"] = time.perf_counter() - phase_start
+
+            image_content, mode = self.capture_images(wd, challenge, timings)
+            i = len(tiles)
+
+            task_text = challenge["instructions"].strip().replace("\n", " ")
 
             continuous_task = 'once there are none left' in task_text.lower()
 
@@ -110,6 +115,12 @@ class SolveCaptcha(BaseTool):
             task_text = task_text.replace("all", "only")
             task_text = task_text.replace("squares", "images")
 
+            if mode == "composite":
+                provided = (f"one image of a grid of {i} tiles, each outlined and labelled in its top-left corner "
+                            f"with its number from 1 to {i}")
+            else:
+                provided = f"{i} images numbered from 1 to {i}"
+
             additional_info = ""
             if len(tiles) > 9:
                 additional_info = ("Keep in mind that all images are a part of a bigger image "
@@ -119,7 +130,7 @@ class SolveCaptcha(BaseTool):
                 {
                     "role": "system",
                     "content": f"""You are an advanced AI designed to support users with visual impairments. 
-                    User will provide you with {i} images numbered from 1 to {i}. Your task is to output 
+                    User will provide you with {provided}. Your task is to output 
                     the numbers of the images that contain the requested object, or at least some part of the requested 
                     object. {additional_info}If there are no individual images that satisfy this condition, output 0.
                     """.replace("\n", ""),
@@ -136,7 +147,8 @@ class SolveCaptcha(BaseTool):
                     ]
                 }]
 
-            response = client.chat.completions.create(
+            phase_start = time.perf_counter()
+            response = get_llm_gateway().chat_completion(
                 model="gpt-4o",
                 messages=messages,
                 max_tokens=1024,
@@ -145,6 +157,8 @@ class SolveCaptcha(BaseTool):
 
             message = response.choices[0].message
             message_text = message.content
+            timings["llm"] = time.perf_counter() - phase_start
+            self.record_timings(timings)
 
             # check if 0 is in the message
             if "0" in message_text and "10" not in message_text:
@@ -156,7 +170,7 @@ class SolveCaptcha(BaseTool):
                 # Click the button
                 wd.execute_script("arguments[0].click();", verify_button)
 
-                time.sleep(1)
+                wait_for_page_ready(wd, step="SolveCaptcha")
 
                 try:
                     if self.verify_checkbox(wd):
@@ -171,9 +185,9 @@ class SolveCaptcha(BaseTool):
                 # Click the tiles based on the provided numbers
                 for number in numbers:
                     wd.execute_script("arguments[0].click();", tiles[number - 1])
-                    time.sleep(0.5)
 
-                time.sleep(3)
+                # Clicked tiles may be replaced by new images that fade in
+                wait_for_page_ready(wd, step="SolveCaptcha")
 
                 if not continuous_task:
                     # Find the button by its ID
@@ -212,6 +226,62 @@ class SolveCaptcha(BaseTool):
 
         return "Could not solve captcha."
 
+    def capture_images(self, wd, challenge, timings):
+        """
+        Message content with the challenge images for the configured capture mode, and the mode actually used
+        (tiles when Pillow is missing); fills timings per phase.
+        """
+        tiles = challenge["tiles"]
+        mode = self.capture_mode
+        sliced = None
+
+        if mode != "tiles":
+            phase_start = time.perf_counter()
+            grid_png = challenge["grid"].screenshot_as_png
+            timings["capture"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            try:
+                sliced = slice_image(grid_png, challenge["boxes"], challenge["gridWidth"], annotate=mode == "composite")
+            except ImportError:
+                # Pillow is not installed; capture the tiles one by one
+                mode = "tiles"
+            timings["slice"] = time.perf_counter() - phase_start
+
+        # Sliced images are re-encoded in the configured format; element screenshots are PNG
+        mime = "image/png" if mode == "tiles" else f"image/{screenshot_config['format']}"
+
+        if mode == "composite":
+            return [
+                {"type": "text", "text": f"The grid of images, numbered 1 to {len(tiles)}:"},
+                {"type": "image_url", "image_url": {
+                    "url": f"data:{mime};base64,{base64.b64encode(sliced['composite']).decode()}",
+                    "detail": "high",
+                }},
+            ], mode
+
+        if mode == "tiles":
+            phase_start = time.perf_counter()
+            # Tiles live in the challenge iframe; selenium maps element screenshots to the screen across frames
+            screenshots = [tile.screenshot_as_base64 for tile in tiles]
+            timings["capture"] = timings.get("capture", 0) + time.perf_counter() - phase_start
+        else:
+            screenshots = [base64.b64encode(tile).decode() for tile in sliced["tiles"]]
+
+        image_content = []
+        for i, screenshot in enumerate(screenshots, start=1):
+            image_content.append({"type": "text", "text": f"Image {i}:"})
+            image_content.append({"type": "image_url", "image_url": {
+                "url": f"data:{mime};base64,{screenshot}",
+                "detail": "high",
+            }})
+        return image_content, mode
+
+    def record_timings(self, timings):
+        for phase, seconds in timings.items():
+            registry.observe("captcha_phase_seconds", seconds, phase=phase, mode=self.capture_mode)
+        print("SolveCaptcha attempt: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items()))
+
     def verify_checkbox(self, wd):
         wd.switch_to.default_content()
 
@@ -1,39 +1,135 @@
+import time
+
+from pydantic import Field
 from selenium.webdriver.common.by import By
 
 from agency_swarm.tools import BaseTool
+from shared_tools.llm_gateway import get_llm_gateway
+from shared_tools.tokens import chunk_text, count_tokens
 from .util import get_web_driver, set_web_driver
 
+MODEL = "gpt-3.5-turbo"
+
+# Rounds of combining partial summaries before the final reduce
+MAX_REDUCE_ROUNDS = 3
+
+SYSTEM_PROMPT = "Your task is to summarize the content of the provided webpage. The summary should be concise and informative, capturing the main points and takeaways of the page."
+
+CHUNK_SYSTEM_PROMPT = "Your task is to summarize one section of a longer webpage. Capture every main point, figure and takeaway in the section concisely; the section summaries will be combined later."
+
+REDUCE_SYSTEM_PROMPT = "You are given summaries of consecutive sections of one webpage. Combine them into a single concise and informative summary of the whole page, capturing the main points and takeaways without repeating yourself."
+
 
 class WebPageSummarizer(BaseTool):
     """
     This tool summarizes the content of the current web page, extracting the main points and providing a concise summary.
     """
+    chunk_token_budget: int = Field(
+        default=3000,
+        description="Maximum number of tokens of page text sent in a single request. Longer pages are summarized in sections first."
+    )
 
     def run(self):
-        from agency_swarm import get_openai_client
+        # Reuse the text extracted by ReadURL's HTTP fast path instead of reading the DOM
+        page = self._shared_state.get("page_text")
+        if page and page.get("text"):
+            content = page["text"]
+        else:
+            wd = get_web_driver(self._caller_agent)
+            content = wd.find_element(By.TAG_NAME, "body").text
 
-        wd = get_web_driver()
-        client = get_openai_client()
+        summary, stats = self.summarize(content)
+        stats["source"] = page["tier"] if page and page.get("text") else "browser"
 
-        content = wd.find_element(By.TAG_NAME, "body").text
+        self._shared_state.set("summary_stats", stats)
 
-        # only use the first 10000 characters
-        content = " ".join(content.split()[:10000])
+        return summary
 
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Your task is to summarize the content of the provided webpage. The summary should be concise and informative, capturing the main points and takeaways of the page."},
-                {"role": "user", "content": "Summarize the content of the following webpage:\n\n" + content},
-            ],
-            temperature=0.0,
+    def summarize(self, content: str):
+        """
+        Summarizes page text and returns (summary, stats). Short pages are summarized in one request;
+        longer pages are split into chunks that are summarized in parallel and then reduced in a final pass.
+        stats holds the timing (seconds) and token counts of each stage.
+        """
+        start = time.perf_counter()
+        content_tokens = count_tokens(content, MODEL)
+        stats = {"content_tokens": content_tokens, "stages": []}
+
+        # Fast path: the whole page fits in one request
+        if content_tokens <= self.chunk_token_budget:
+            summary = self._summarize_one(SYSTEM_PROMPT, "Summarize the content of the following webpage:\n\n" + content)
+            stats["stages"].append(self._stage_stats("single", start, [content], [summary]))
+            stats["total_time"] = time.perf_counter() - start
+            return summary, stats
+
+        # Map: summarize every chunk concurrently through the gateway
+        map_start = time.perf_counter()
+        chunks = chunk_text(content, self.chunk_token_budget, MODEL)
+        partials = self._summarize_many(
+            CHUNK_SYSTEM_PROMPT,
+            [f"Summarize section {i} of {len(chunks)} of the webpage:\n\n{chunk}" for i, chunk in enumerate(chunks, 1)]
         )
+        stats["stages"].append(self._stage_stats("map", map_start, chunks, partials))
 
+        # Reduce: combine partial summaries, in several rounds if they still exceed the budget
+        level = 1
+        while True:
+            reduce_start = time.perf_counter()
+            combined = "\n\n".join(f"Section {i} summary:\n{partial}" for i, partial in enumerate(partials, 1))
+            fits = count_tokens(combined, MODEL) <= self.chunk_token_budget
+            groups = [] if fits else chunk_text(combined, self.chunk_token_budget, MODEL)
+            # Stop reducing when the summaries fit, or when another round would not shrink them (the model's
+            # summaries are not getting shorter, or the round limit is reached); then reduce what fits the budget
+            if fits or len(partials) == 1 or len(groups) >= len(partials) or level > MAX_REDUCE_ROUNDS:
+                if not fits:
+                    combined = groups[0]
+                    stats["truncated"] = True
+                summary = self._summarize_one(REDUCE_SYSTEM_PROMPT, combined)
+                stats["stages"].append(self._stage_stats(f"reduce_{level}", reduce_start, [combined], [summary]))
+                break
+
+            partials = self._summarize_many(REDUCE_SYSTEM_PROMPT, groups)
+            stats["stages"].append(self._stage_stats(f"reduce_{level}", reduce_start, groups, partials))
+            level += 1
+
+        stats["total_time"] = time.perf_counter() - start
+        return summary, stats
+
+    def _messages(self, system_prompt: str, user_content: str):
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+
+    def _summarize_one(self, system_prompt: str, user_content: str) -> str:
+        completion = get_llm_gateway().chat_completion(
+            model=MODEL,
+            messages=self._messages(system_prompt, user_content),
+            temperature=0.0,
+        )
         return completion.choices[0].message.content
 
+    def _summarize_many(self, system_prompt: str, user_contents):
+        gateway = get_llm_gateway()
+        futures = [
+            gateway.submit(model=MODEL, messages=self._messages(system_prompt, content), temperature=0.0)
+            for content in user_contents
+        ]
+        return [future.result().choices[0].message.content for future in futures]
+
+    def _stage_stats(self, name: str, start: float, inputs, outputs):
+        return {
+            "stage": name,
+            "requests": len(inputs),
+            "input_tokens": sum(count_tokens(text, MODEL) for text in inputs),
+            "output_tokens": sum(count_tokens(text or "", MODEL) for text in outputs),
+            "time": time.perf_counter() - start,
+        }
+
 if __name__ == "__main__":
     wd = get_web_driver()
     wd.get("https://en.wikipedia.org/wiki/Python_(programming_language)")
     set_web_driver(wd)
     tool = WebPageSummarizer()
-    print(tool.run())
\ No newline at end of file
+    print(tool.run())
+    print(tool._shared_state.get("summary_stats"))
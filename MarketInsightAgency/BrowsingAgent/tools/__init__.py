@@ -1,9 +1,22 @@
-from .Scroll import Scroll
-from .ReadURL import ReadURL
-from .SendKeys import SendKeys
-from .ClickElement import ClickElement
-from .GoBack import GoBack
-from .SelectDropdown import SelectDropdown
-from .SolveCaptcha import SolveCaptcha
-from .ExportFile import ExportFile
-from .WebPageSummarizer import WebPageSummarizer
\ No newline at end of file
+from importlib import import_module
+
+# Tools are imported on first access so that loading one tool (e.g. SerpAPISearch)
+# does not pull in selenium and every other browsing dependency.
+__all__ = [
+    'Scroll',
+    'ReadURL',
+    'SendKeys',
+    'ClickElement',
+    'GoBack',
+    'SelectDropdown',
+    'SolveCaptcha',
+    'ExportFile',
+    'WebPageSummarizer',
+    'MultiQuerySearch',
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(import_module(f'.{name}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
 from .get_b64_screenshot import get_b64_screenshot
-from .selenium import get_web_driver, set_web_driver
-from .highlights import remove_highlight_and_labels, highlight_elements_with_labels
+from .selenium import get_web_driver, set_web_driver, release_web_driver
+from .highlights import (remove_highlight_and_labels, highlight_elements_with_labels, index_elements_with_labels,
+                         get_highlighted_element)
@@ -1,8 +1,10 @@
+import base64
+
+from .screenshots import capture_screenshot
+
 
 def get_b64_screenshot(wd, element=None):
-    if element:
-        screenshot_b64 = element.screenshot_as_base64
-    else:
-        screenshot_b64 = wd.get_screenshot_as_base64()
+    screenshot = capture_screenshot(wd, element)
+    screenshot_b64 = base64.b64encode(screenshot["data"]).decode("ascii")
 
-    return screenshot_b64
\ No newline at end of file
+    return screenshot_b64
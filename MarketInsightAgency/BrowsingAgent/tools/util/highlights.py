@@ -1,3 +1,163 @@
+from selenium.webdriver.common.by import By
+
+# Indexes, labels and describes all visible elements matching arguments[0] in a single pass, so the whole
+# operation is one round trip. Layout is read for every candidate before anything is written to the DOM,
+# elements outside the viewport are dropped before any style is computed, and ancestor visibility is cached.
+INDEX_SCRIPT = """
+var selector = arguments[0];
+var maxText = arguments[1];
+
+// Clear the previous run
+document.querySelectorAll('.highlight-label').forEach(function(label) { label.remove(); });
+document.querySelectorAll('[data-hl-index]').forEach(function(element) {
+    element.classList.remove('highlighted-element');
+    element.removeAttribute('data-hl-index');
+});
+
+var viewportHeight = window.innerHeight || document.documentElement.clientHeight;
+var viewportWidth = window.innerWidth || document.documentElement.clientWidth;
+var hiddenCache = new Map();
+
+function isHidden(element) {
+    // display/visibility of an element and all its ancestors, memoized per element
+    if (!element || element === document.documentElement) return false;
+    if (hiddenCache.has(element)) return hiddenCache.get(element);
+    var style = window.getComputedStyle(element);
+    var hidden = style.display === 'none' || style.visibility === 'hidden' || isHidden(element.parentElement);
+    hiddenCache.set(element, hidden);
+    return hidden;
+}
+
+function isVisible(element) {
+    if (element.checkVisibility) {
+        return element.checkVisibility({visibilityProperty: true});
+    }
+    return !isHidden(element);
+}
+
+function describe(element) {
+    var text = element.innerText || element.value || element.getAttribute('aria-label') ||
+        element.getAttribute('placeholder') || element.getAttribute('title') || element.getAttribute('alt') || '';
+    return text.replace(/\\s+/g, ' ').trim().slice(0, maxText);
+}
+
+function stableSelector(element) {
+    // Shortest selector that survives the highlight attributes being removed
+    if (element.id && document.querySelectorAll('#' + CSS.escape(element.id)).length === 1) {
+        return '#' + CSS.escape(element.id);
+    }
+    var tag = element.tagName.toLowerCase();
+    var attributes = ['data-testid', 'name', 'aria-label'];
+    for (var i = 0; i < attributes.length; i++) {
+        var value = element.getAttribute(attributes[i]);
+        if (value) {
+            var candidate = tag + '[' + attributes[i] + '="' + CSS.escape(value) + '"]';
+            if (document.querySelectorAll(candidate).length === 1) return candidate;
+        }
+    }
+    var path = [];
+    var node = element;
+    while (node && node.nodeType === 1 && node !== document.body) {
+        if (node.id && node !== element) {
+            path.unshift('#' + CSS.escape(node.id));
+            break;
+        }
+        var position = 1;
+        for (var sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) position++;
+        }
+        path.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + position + ')');
+        node = node.parentElement;
+    }
+    return path.join(' > ');
+}
+
+// Read phase: viewport prefilter on the bounding box, then visibility
+var candidates = [];
+document.querySelectorAll(selector).forEach(function(element) {
+    var rect = element.getBoundingClientRect();
+    if (rect.width <= 0 || rect.height <= 0 || rect.top >= viewportHeight || rect.bottom <= 0 ||
+        rect.left >= viewportWidth || rect.right <= 0) {
+        return;
+    }
+    if (isVisible(element)) {
+        candidates.push({element: element, rect: rect});
+    }
+});
+
+var index = candidates.map(function(candidate, i) {
+    var rect = candidate.rect;
+    return {
+        index: i + 1,
+        tag: candidate.element.tagName.toLowerCase(),
+        type: candidate.element.getAttribute('type') || '',
+        text: describe(candidate.element),
+        bbox: [Math.round(rect.left + window.scrollX), Math.round(rect.top + window.scrollY),
+               Math.round(rect.width), Math.round(rect.height)],
+        selector: stableSelector(candidate.element)
+    };
+});
+
+// Write phase: style, attributes and labels
+var styleElement = document.getElementById('highlight-style');
+if (!styleElement) {
+    styleElement = document.createElement('style');
+    styleElement.id = 'highlight-style';
+    document.head.appendChild(styleElement);
+}
+styleElement.textContent = `
+    .highlighted-element {
+        border: 2px solid red !important;
+        position: relative;
+        box-sizing: border-box;
+    }
+    .highlight-label {
+        position: absolute;
+        z-index: 2147483647;
+        background: yellow;
+        color: black;
+        font-size: 25px;
+        padding: 3px 5px;
+        border: 1px solid black;
+        border-radius: 3px;
+        white-space: nowrap;
+        box-shadow: 0px 0px 2px #000;
+    }
+`;
+
+var labels = document.createDocumentFragment();
+candidates.forEach(function(candidate, i) {
+    candidate.element.classList.add('highlighted-element');
+    candidate.element.setAttribute('data-hl-index', i + 1);
+
+    var label = document.createElement('div');
+    label.className = 'highlight-label';
+    label.textContent = (i + 1).toString();
+    // Position the label above the element
+    label.style.top = (candidate.rect.top + window.scrollY - 25) + 'px';
+    label.style.left = (candidate.rect.left + window.scrollX) + 'px';
+    labels.appendChild(label);
+});
+document.body.appendChild(labels);
+
+return index;
+"""
+
+
+def index_elements_with_labels(driver, selector, max_text=80):
+    """
+    Highlights and numbers the visible elements matching the CSS selector and returns their index:
+    a list of {index, tag, type, text, bbox [x, y, width, height], selector}, numbered from 1 in the same
+    order as the labels on the page. The index is also kept on the driver for get_highlighted_element.
+
+    :param driver: Instance of Selenium WebDriver.
+    :param selector: CSS selector for the elements to be highlighted.
+    """
+    element_index = driver.execute_script(INDEX_SCRIPT, selector, max_text) or []
+    driver._element_index = {entry["index"]: entry for entry in element_index}
+    return element_index
+
+
 def highlight_elements_with_labels(driver, selector):
     """
     This function highlights clickable elements like buttons, links, and certain divs and spans
@@ -7,106 +167,26 @@ def highlight_elements_with_labels(driver, selector):
     :param driver: Instance of Selenium WebDriver.
     :param selector: CSS selector for the elements to be highlighted.
     """
-    script = f"""
-        // Helper function to check if an element is visible
-        function isElementVisible(element) {{
-            var rect = element.getBoundingClientRect();
-            if (rect.width <= 0 || rect.height <= 0 || 
-                rect.top >= (window.innerHeight || document.documentElement.clientHeight) || 
-                rect.bottom <= 0 || 
-                rect.left >= (window.innerWidth || document.documentElement.clientWidth) || 
-                rect.right <= 0) {{
-                return false;
-            }}
-            // Check if any parent element is hidden, which would hide this element as well
-            var parent = element;
-            while (parent) {{
-                var style = window.getComputedStyle(parent);
-                if (style.display === 'none' || style.visibility === 'hidden') {{
-                    return false;
-                }}
-                parent = parent.parentElement;
-            }}
-            return true;
-        }}
-
-        // Remove previous labels and styles if they exist
-        document.querySelectorAll('.highlight-label').forEach(function(label) {{
-            label.remove();
-        }});
-        document.querySelectorAll('.highlighted-element').forEach(function(element) {{
-            element.classList.remove('highlighted-element');
-            element.removeAttribute('data-highlighted');
-        }});
-
-        // Inject custom style for highlighting elements
-        var styleElement = document.getElementById('highlight-style');
-        if (!styleElement) {{
-            styleElement = document.createElement('style');
-            styleElement.id = 'highlight-style';
-            document.head.appendChild(styleElement);
-        }}
-        styleElement.textContent = `
-            .highlighted-element {{ 
-                border: 2px solid red !important; 
-                position: relative; 
-                box-sizing: border-box; 
-            }}
-            .highlight-label {{ 
-                position: absolute; 
-                z-index: 2147483647; 
-                background: yellow; 
-                color: black; 
-                font-size: 25px; 
-                padding: 3px 5px; 
-                border: 1px solid black; 
-                border-radius: 3px; 
-                white-space: nowrap; 
-                box-shadow: 0px 0px 2px #000; 
-                top: -25px; 
-                left: 0; 
-                display: none;
-            }}
-        `;
-
-        // Function to create and append a label to the body
-        function createAndAdjustLabel(element, index) {{
-            if (!isElementVisible(element)) return;
-
-            element.classList.add('highlighted-element');
-            var label = document.createElement('div');
-            label.className = 'highlight-label';
-            label.textContent = index.toString();
-            label.style.display = 'block'; // Make the label visible
-
-            // Calculate label position
-            var rect = element.getBoundingClientRect();
-            var top = rect.top + window.scrollY - 25; // Position label above the element
-            var left = rect.left + window.scrollX;
-
-            label.style.top = top + 'px';
-            label.style.left = left + 'px';
-
-            document.body.appendChild(label); // Append the label to the body
-        }}
-
-        // Select all clickable elements and apply the styles
-        var allElements = document.querySelectorAll('{selector}');
-        var index = 1;
-        allElements.forEach(function(element) {{
-            // Check if the element is not already highlighted and is visible
-            if (!element.dataset.highlighted && isElementVisible(element)) {{
-                element.dataset.highlighted = 'true';
-                createAndAdjustLabel(element, index++);
-            }}
-        }});
-        """
-
-    driver.execute_script(script)
+    index_elements_with_labels(driver, selector)
 
     return driver
 
 
+def get_highlighted_element(driver, number):
+    """
+    Returns (element, entry) for the element labelled with number by the last highlight, where entry is its
+    index entry (tag, text, bbox, selector). Raises IndexError if there is no such element.
+    """
+    entry = getattr(driver, "_element_index", {}).get(number)
+    elements = driver.find_elements(By.CSS_SELECTOR, f'[data-hl-index="{number}"]')
+    if not elements and entry:
+        # The page re-rendered and dropped the attribute; fall back to the stable selector
+        elements = driver.find_elements(By.CSS_SELECTOR, entry["selector"])
+    if not elements:
+        raise IndexError(f"No highlighted element with number {number}")
+    return elements[0], entry or {}
+
+
 def remove_highlight_and_labels(driver):
     """
     This function removes all red borders and labels from the webpage elements,
@@ -114,26 +194,26 @@ def remove_highlight_and_labels(driver):
 
     :param driver: Instance of Selenium WebDriver.
     """
-    selector = ('a, button, input, textarea, div[onclick], div[role="button"], div[tabindex], span[onclick], '
-                'span[role="button"], span[tabindex]')
-    script = f"""
+    script = """
         // Remove all labels
-        document.querySelectorAll('.highlight-label').forEach(function(label) {{
+        document.querySelectorAll('.highlight-label').forEach(function(label) {
             label.remove();
-        }});
+        });
 
         // Remove the added style for red borders
         var highlightStyle = document.getElementById('highlight-style');
-        if (highlightStyle) {{
+        if (highlightStyle) {
             highlightStyle.remove();
-        }}
+        }
 
-        // Remove inline styles added by highlighting function
-        document.querySelectorAll('{selector}').forEach(function(element) {{
-            element.style.border = '';
-        }});
+        // Remove the classes and index attributes added by the highlighting function
+        document.querySelectorAll('.highlighted-element, [data-hl-index]').forEach(function(element) {
+            element.classList.remove('highlighted-element');
+            element.removeAttribute('data-hl-index');
+        });
         """
 
     driver.execute_script(script)
+    driver._element_index = {}
 
-    return driver
\ No newline at end of file
+    return driver
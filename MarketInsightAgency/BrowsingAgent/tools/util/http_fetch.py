@@ -0,0 +1,144 @@
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+from shared_tools.http_client import get_http_client
+
+# Default fast-path settings, overridable through environment variables
+fetch_config = {
+    "timeout": float(os.getenv("FAST_FETCH_TIMEOUT", 8)),
+    "max_bytes": int(os.getenv("FAST_FETCH_MAX_BYTES", 3_000_000)),
+    # Pages with less extracted text than this are assumed to be rendered by JavaScript
+    "min_text_chars": int(os.getenv("FAST_FETCH_MIN_TEXT_CHARS", 500)),
+    "user_agent": os.getenv(
+        "FAST_FETCH_USER_AGENT",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+}
+
+# Elements that never hold the main content
+NOISE_TAGS = ["script", "style", "noscript", "template", "svg", "canvas", "iframe", "form",
+              "nav", "header", "footer", "aside", "button", "select"]
+
+# Markup of client-side rendered apps; only decisive when the page also has little text
+SPA_MARKERS = re.compile(
+    r'id="(root|app|__next|__nuxt|svelte)"|data-reactroot|ng-app|ng-version|window\.__NUXT__|window\.__INITIAL_STATE__',
+    re.IGNORECASE,
+)
+
+# Bot protection and "enable JavaScript" interstitials
+CHALLENGE_MARKERS = re.compile(
+    r"cf-browser-verification|challenge-platform|just a moment\.\.\.|captcha|"
+    r"enable javascript|javascript is (disabled|required)|please turn on javascript",
+    re.IGNORECASE,
+)
+
+BLOCK_TAGS = ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote", "td", "th", "dt", "dd", "figcaption"]
+
+
+def _fetch_headers():
+    # Browser-like headers, since some sites serve bots a different (or no) page
+    return {
+        "User-Agent": fetch_config["user_agent"],
+        "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+
+def extract_main_text(html: str):
+    """
+    Returns (title, text) for the main content of an HTML page: <article>, <main> or role="main" when present,
+    otherwise the container holding the most paragraph text. Text is one line per block element.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    root = soup.find("article") or soup.find("main") or soup.find(attrs={"role": "main"})
+    if root is None:
+        # Score each paragraph's parent by the text it contains
+        scores = {}
+        for paragraph in soup.find_all("p"):
+            parent = paragraph.parent
+            if parent is not None:
+                scores[parent] = scores.get(parent, 0) + len(paragraph.get_text(strip=True))
+        root = max(scores, key=scores.get) if scores else (soup.body or soup)
+
+    lines = []
+    for block in root.find_all(BLOCK_TAGS):
+        # Skip blocks nested in another block (e.g. <p> inside <li>) to avoid duplicates
+        if block.find_parent(BLOCK_TAGS) is not None:
+            continue
+        text = " ".join(block.get_text(" ", strip=True).split())
+        if text:
+            lines.append(text)
+    if not lines:
+        lines = [line.strip() for line in root.get_text("\n").splitlines() if line.strip()]
+
+    return title, "\n".join(lines)
+
+
+def needs_browser(status: int, content_type: str, html: str, text: str) -> Optional[str]:
+    """Returns why the page has to be rendered in the browser, or None if the HTTP result is usable."""
+    if status >= 400:
+        return f"HTTP status {status}"
+    if "html" not in content_type:
+        return f"content type {content_type or 'unknown'}"
+    # Interstitials are short; a long article that merely mentions captchas is fine
+    if len(text) < 2 * fetch_config["min_text_chars"] and CHALLENGE_MARKERS.search(html[:20000]):
+        return "bot protection or JavaScript notice"
+    if len(text) < fetch_config["min_text_chars"]:
+        if SPA_MARKERS.search(html):
+            return "client-side rendered app"
+        if "<noscript" in html.lower():
+            return "content requires JavaScript"
+        return f"only {len(text)} characters of text"
+    return None
+
+
+def _detect_encoding(content_type: str, content: bytes) -> str:
+    match = re.search(r"charset=([\w-]+)", content_type, re.IGNORECASE) or \
+        re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', content[:4096], re.IGNORECASE)
+    if match:
+        encoding = match.group(1)
+        encoding = encoding.decode("ascii") if isinstance(encoding, bytes) else encoding
+        try:
+            "".encode(encoding)
+            return encoding
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def fetch_page_text(url: str) -> Dict[str, Any]:
+    """
+    Fetches a page over HTTP and extracts its main text. Returns a dict with url (after redirects), title, text,
+    fetch_time and browser_reason, which is None when the text is usable and otherwise says why it is not.
+    """
+    start = time.perf_counter()
+    result = {"url": url, "title": "", "text": "", "browser_reason": None}
+    try:
+        # The shared client reuses connections to hosts the agency has already talked to
+        response = get_http_client().get(url, headers=_fetch_headers(), timeout=fetch_config["timeout"], stream=True)
+        content = response.raw.read(fetch_config["max_bytes"] + 1, decode_content=True)
+        response.close()
+        result["url"] = response.url
+
+        if len(content) > fetch_config["max_bytes"]:
+            result["browser_reason"] = "page too large"
+        else:
+            html = content.decode(_detect_encoding(response.headers.get("Content-Type", ""), content), errors="replace")
+            result["title"], result["text"] = extract_main_text(html)
+            result["browser_reason"] = needs_browser(
+                response.status_code, response.headers.get("Content-Type", "").lower(), html, result["text"]
+            )
+    except Exception as e:
+        result["browser_reason"] = f"HTTP fetch failed: {type(e).__name__}"
+
+    result["fetch_time"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,221 @@
+import base64
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from shared_tools.metrics import BYTES_BUCKETS, registry
+
+# Default screenshot settings, overridable through environment variables
+screenshot_config = {
+    # jpeg or webp are much smaller than png for page screenshots; png is lossless
+    "format": os.getenv("BROWSER_SCREENSHOT_FORMAT", "jpeg"),
+    "quality": int(os.getenv("BROWSER_SCREENSHOT_QUALITY", 70)),
+    # Longest side in CSS pixels; larger captures are scaled down by the browser
+    "max_dimension": int(os.getenv("BROWSER_SCREENSHOT_MAX_DIMENSION", 1280)),
+    # Side of the difference hash grid; larger grids notice smaller changes (e.g. text typed into a field)
+    "hash_size": int(os.getenv("BROWSER_SCREENSHOT_HASH_SIZE", 16)),
+    # Frames whose perceptual hashes differ in at most this many bits are treated as unchanged
+    "hash_threshold": int(os.getenv("BROWSER_SCREENSHOT_HASH_THRESHOLD", 0)),
+    "cache_size": int(os.getenv("BROWSER_SCREENSHOT_CACHE_SIZE", 256)),
+}
+
+FILE_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+# Region to capture in page coordinates: the element's bounding box, or the visible viewport. Rects are relative
+# to the current browsing context, so inside a frame they do not match the top-level page CDP captures.
+CLIP_SCRIPT = """
+var element = arguments[0];
+if (window.top !== window) {
+    return {nested: true};
+}
+if (element) {
+    var rect = element.getBoundingClientRect();
+    return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+}
+return {x: window.scrollX, y: window.scrollY, width: window.innerWidth, height: window.innerHeight};
+"""
+
+
+def capture_screenshot(wd, element=None) -> Dict[str, Any]:
+    """
+    Captures the viewport (or an element) with CDP Page.captureScreenshot in the configured format and quality,
+    scaled down so the longest side is at most max_dimension. Falls back to selenium's PNG screenshot on drivers
+    without CDP and when the driver is switched into a frame, where selenium maps the element to the screen
+    itself. Returns a dict with data (bytes), format, width, height and capture_time.
+    """
+    start = time.perf_counter()
+    fmt = screenshot_config["format"]
+    data = None
+    try:
+        clip = wd.execute_script(CLIP_SCRIPT, element)
+        if not clip.get("nested"):
+            scale = min(1.0, screenshot_config["max_dimension"] / max(clip["width"], clip["height"], 1))
+            params = {"format": fmt, "clip": {**clip, "scale": scale}, "captureBeyondViewport": False}
+            if fmt != "png":
+                params["quality"] = screenshot_config["quality"]
+            data = base64.b64decode(wd.execute_cdp_cmd("Page.captureScreenshot", params)["data"])
+            width, height = round(clip["width"] * scale), round(clip["height"] * scale)
+    except Exception:
+        data = None
+
+    if data is None:
+        fmt = "png"
+        data = element.screenshot_as_png if element is not None else wd.get_screenshot_as_png()
+        width = height = None
+
+    capture_time = time.perf_counter() - start
+    registry.observe("screenshot_capture_seconds", capture_time, format=fmt)
+    registry.observe("screenshot_bytes", len(data), buckets=BYTES_BUCKETS, format=fmt)
+    return {"data": data, "format": fmt, "width": width, "height": height, "capture_time": capture_time}
+
+
+def _encode(image) -> bytes:
+    fmt = screenshot_config["format"]
+    buffer = io.BytesIO()
+    if fmt == "png":
+        image.save(buffer, format="PNG")
+    else:
+        image.convert("RGB").save(buffer, format=fmt.upper(), quality=screenshot_config["quality"])
+    return buffer.getvalue()
+
+
+def slice_image(data: bytes, boxes, css_width: float, annotate: bool = False) -> Dict[str, Any]:
+    """
+    Cuts one captured image into regions locally instead of capturing every region separately. boxes are
+    (x, y, width, height) in CSS pixels relative to the image's top-left corner and css_width is the image's
+    width in CSS pixels, from which the device pixel ratio is derived.
+
+    Returns {"tiles": [bytes, ...], "composite": bytes or None} encoded in the configured format; with annotate
+    the composite is the whole image with every region outlined and numbered from 1. Raises ImportError without Pillow.
+    """
+    from PIL import Image, ImageDraw
+
+    image = Image.open(io.BytesIO(data))
+    ratio = image.width / css_width if css_width else 1.0
+    pixel_boxes = [
+        (round(x * ratio), round(y * ratio), round((x + width) * ratio), round((y + height) * ratio))
+        for x, y, width, height in boxes
+    ]
+    tiles = [_encode(image.crop(box)) for box in pixel_boxes]
+
+    composite = None
+    if annotate:
+        annotated = image.convert("RGB")
+        draw = ImageDraw.Draw(annotated)
+        for number, box in enumerate(pixel_boxes, start=1):
+            draw.rectangle(box, outline="red", width=max(1, round(2 * ratio)))
+            label_box = (box[0], box[1], box[0] + round(22 * ratio), box[1] + round(18 * ratio))
+            draw.rectangle(label_box, fill="yellow")
+            draw.text((box[0] + round(4 * ratio), box[1] + round(3 * ratio)), str(number), fill="black")
+        composite = _encode(annotated)
+
+    return {"tiles": tiles, "composite": composite}
+
+
+def perceptual_hash(data: bytes) -> str:
+    """
+    Difference hash (dHash) of the image as hex, hash_size squared bits, so re-encodings and sub-pixel repaints
+    of the same page hash alike. Without Pillow it falls back to a SHA-256 of the bytes, which only matches identical frames.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return "sha256:" + hashlib.sha256(data).hexdigest()
+
+    size = screenshot_config["hash_size"]
+    pixels = list(Image.open(io.BytesIO(data)).convert("L").resize((size + 1, size)).getdata())
+    bits = 0
+    for row in range(size):
+        for column in range(size):
+            bits = (bits << 1) | (pixels[row * (size + 1) + column] > pixels[row * (size + 1) + column + 1])
+    return f"{bits:0{size * size // 4}x}"
+
+
+def hash_distance(a: str, b: str) -> int:
+    """Number of differing bits between two dHashes; SHA-256 fallbacks and hashes of different sizes only match if equal."""
+    if a.startswith("sha256:") or b.startswith("sha256:") or len(a) != len(b):
+        return 0 if a == b else 4 * max(len(a), len(b))
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class ScreenshotUploader:
+    """
+    Uploads screenshots to the Files API through the LLM gateway, reusing the file id of a previously uploaded
+    frame when the new one is perceptually unchanged (e.g. after a scroll that did not move the page).
+    Keeps stats on uploads skipped and the bytes and upload time they saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # hash -> file id, least recently used first
+        self._file_ids = OrderedDict()
+        self.stats = {"uploads": 0, "reused": 0, "bytes_uploaded": 0, "bytes_saved": 0,
+                      "upload_seconds": 0.0, "upload_seconds_saved": 0.0}
+
+    def _find(self, frame_hash: str) -> Optional[str]:
+        for cached_hash in reversed(self._file_ids):
+            if hash_distance(frame_hash, cached_hash) <= screenshot_config["hash_threshold"]:
+                self._file_ids.move_to_end(cached_hash)
+                return self._file_ids[cached_hash]
+        return None
+
+    def upload(self, data: bytes, fmt: str = "jpeg", purpose: str = "vision") -> Dict[str, Any]:
+        """Returns a dict with file_id, hash and reused (True when an earlier upload was reused)."""
+        frame_hash = perceptual_hash(data)
+        with self._lock:
+            file_id = self._find(frame_hash)
+            if file_id:
+                self.stats["reused"] += 1
+                self.stats["bytes_saved"] += len(data)
+                if self.stats["uploads"]:
+                    self.stats["upload_seconds_saved"] += self.stats["upload_seconds"] / self.stats["uploads"]
+                registry.inc("screenshot_uploads_total", outcome="reused")
+                return {"file_id": file_id, "hash": frame_hash, "reused": True}
+
+        from shared_tools.llm_gateway import get_llm_gateway
+
+        with tempfile.NamedTemporaryFile(suffix="." + FILE_EXTENSIONS.get(fmt, fmt), delete=False) as f:
+            f.write(data)
+        start = time.perf_counter()
+        try:
+            file_id = get_llm_gateway().upload_file(f.name, purpose=purpose)
+        finally:
+            os.remove(f.name)
+        upload_time = time.perf_counter() - start
+
+        with self._lock:
+            self._file_ids[frame_hash] = file_id
+            while len(self._file_ids) > screenshot_config["cache_size"]:
+                self._file_ids.popitem(last=False)
+            self.stats["uploads"] += 1
+            self.stats["bytes_uploaded"] += len(data)
+            self.stats["upload_seconds"] += upload_time
+        registry.inc("screenshot_uploads_total", outcome="uploaded")
+        registry.observe("screenshot_upload_seconds", upload_time)
+        return {"file_id": file_id, "hash": frame_hash, "reused": False}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+
+_uploader = None
+_uploader_lock = threading.Lock()
+
+
+def get_screenshot_uploader() -> ScreenshotUploader:
+    global _uploader
+    with _uploader_lock:
+        if _uploader is None:
+            _uploader = ScreenshotUploader()
+        return _uploader
+
+
+def set_screenshot_config(config):
+    global screenshot_config
+    screenshot_config = {**screenshot_config, **config}
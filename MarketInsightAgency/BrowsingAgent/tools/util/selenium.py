@@ -1,15 +1,58 @@
+import atexit
+import contextvars
 import os
-
-wd = None
+import shutil
+import socket
+import tempfile
+import threading
+import time
 
 selenium_config = {
     "chrome_profile_path": None,
     "headless": True,
     "full_page_screenshot": True,
+    # Pool settings
+    "pool_size": int(os.getenv("BROWSER_POOL_SIZE", 2)),
+    "max_navigations": int(os.getenv("BROWSER_MAX_NAVIGATIONS", 50)),
+    "idle_timeout": float(os.getenv("BROWSER_IDLE_TIMEOUT", 300)),
+    "lease_timeout": float(os.getenv("BROWSER_LEASE_TIMEOUT", 120)),
+    # Resource types and domains the "text" browsing profile does not load
+    "blocked_resource_types": ["image", "font", "media"],
+    "blocked_domains": [
+        "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+        "googletagmanager.com", "adservice.google.com", "amazon-adsystem.com", "facebook.net",
+        "connect.facebook.net", "scorecardresearch.com", "hotjar.com", "criteo.com", "criteo.net",
+        "taboola.com", "outbrain.com", "adnxs.com", "quantserve.com", "moatads.com", "pubmatic.com",
+        "rubiconproject.com", "segment.io", "mixpanel.com",
+    ],
+}
+
+# Network.setBlockedURLs matches URL patterns, so resource types are blocked by file extension
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "m3u8", "mov"],
+    "stylesheet": ["css"],
 }
 
+# "full" renders the page as a user sees it (screenshots, captcha); "text" is for reading page text
+BROWSING_PROFILES = ("full", "text")
+
+# Session whose browser get_web_driver() returns when no session is passed explicitly
+browser_session = contextvars.ContextVar("browser_session", default="default")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
 
-def get_web_driver():
+def create_web_driver(debugging_port, user_data_dir=None):
+    """Starts a new Chrome instance. Without a configured profile it uses user_data_dir as a throwaway profile."""
     print("Initializing WebDriver...")
     try:
         from selenium import webdriver
@@ -33,15 +76,8 @@ def get_web_driver():
         print("selenium_stealth not installed. Please install it with pip install selenium-stealth")
         raise ImportError
 
-    global wd, selenium_config
-
-    if wd:
-        print("Returning existing WebDriver instance.")
-        return wd
-
     chrome_profile_path = selenium_config.get("chrome_profile_path", None)
     profile_directory = None
-    user_data_dir = None
     if isinstance(chrome_profile_path, str) and os.path.exists(chrome_profile_path):
         profile_directory = os.path.split(chrome_profile_path)[-1].strip("\\").rstrip("/")
         user_data_dir = os.path.split(chrome_profile_path)[0].strip("\\").rstrip("/")
@@ -72,7 +108,7 @@ def get_web_driver():
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--remote-debugging-port=9222")
+    chrome_options.add_argument(f"--remote-debugging-port={debugging_port}")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--ignore-certificate-errors")
@@ -83,10 +119,12 @@ def get_web_driver():
     chrome_options.add_experimental_option("useAutomationExtension", False)
     print("Chrome options configured.")
 
-    if user_data_dir and profile_directory:
+    if user_data_dir:
         chrome_options.add_argument(f"user-data-dir={user_data_dir}")
+        print(f"Using user data dir: {user_data_dir}")
+    if profile_directory:
         chrome_options.add_argument(f"profile-directory={profile_directory}")
-        print(f"Using user data dir: {user_data_dir} and profile directory: {profile_directory}")
+        print(f"Using profile directory: {profile_directory}")
 
     try:
         wd = webdriver.Chrome(service=ChromeService(chrome_driver_path), options=chrome_options)
@@ -115,6 +153,277 @@ def get_web_driver():
     return wd
 
 
+class PooledDriver:
+    """A Chrome instance owned by the pool, with its own debugging port and (temporary) profile directory."""
+
+    def __init__(self, factory):
+        self.port = _find_free_port()
+        # A configured Chrome profile is used as is; otherwise every instance gets a throwaway profile
+        self.profile_dir = None if selenium_config.get("chrome_profile_path") else tempfile.mkdtemp(prefix="chrome-profile-")
+        try:
+            self.wd = factory(self.port, self.profile_dir)
+        except Exception:
+            self._remove_profile()
+            raise
+        self.navigations = 0
+        self.last_url = None
+        self.created = time.monotonic()
+        self.last_used = self.created
+
+    def is_healthy(self):
+        try:
+            self.wd.current_url
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.wd.quit()
+        except Exception as e:
+            print(f"Error closing WebDriver: {e}")
+        self._remove_profile()
+
+    def _remove_profile(self):
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class WebDriverPool:
+    """
+    Hands out one browser per session. A session keeps its browser (and page state) across tool calls until it
+    is released or has been idle for idle_timeout; released browsers are reused by other sessions. Browsers are
+    health-checked before use and replaced after max_navigations page loads to cap Chrome's memory growth.
+    """
+
+    def __init__(self, factory=create_web_driver):
+        self.factory = factory
+        self.condition = threading.Condition()
+        self.leases = {}
+        self.idle = []
+        self.starting = 0
+        self.stats = {"created": 0, "recycled": 0, "unhealthy": 0, "reaped": 0, "waits": 0}
+        self._reaper = None
+
+    @property
+    def size(self):
+        # A Chrome profile directory can only be used by one browser at a time
+        if selenium_config.get("chrome_profile_path"):
+            return 1
+        return max(1, selenium_config.get("pool_size", 1))
+
+    def acquire(self, session):
+        """Returns the session's browser, leasing a free one (or starting a new one) if it has none."""
+        self._start_reaper()
+        resume_url = None
+        with self.condition:
+            driver = self.leases.get(session)
+            if driver and driver.navigations >= selenium_config.get("max_navigations", 50):
+                # Replace the browser and reopen the current page so the session can carry on
+                print(f"Recycling WebDriver after {driver.navigations} navigations.")
+                self.stats["recycled"] += 1
+                resume_url = driver.last_url
+                del self.leases[session]
+                self._discard(driver)
+            elif driver and driver.is_healthy():
+                driver.last_used = time.monotonic()
+                return driver.wd
+            elif driver:
+                print("Leased WebDriver is unresponsive, replacing it.")
+                self.stats["unhealthy"] += 1
+                del self.leases[session]
+                self._discard(driver)
+
+            driver = self._lease_idle(session)
+            while driver is None and not self._reserve_slot():
+                driver = self._lease_idle(session)
+
+        if driver is None:
+            driver = self._start_driver(session)
+        # A browser returned by another session starts over with the full profile
+        apply_browsing_profile(driver.wd, "full", reload=False)
+        if resume_url:
+            driver.wd.get(resume_url)
+            driver.last_url = resume_url
+        return driver.wd
+
+    def _lease_idle(self, session):
+        while self.idle:
+            driver = self.idle.pop()
+            if driver.is_healthy():
+                driver.last_used = time.monotonic()
+                self.leases[session] = driver
+                return driver
+            self.stats["unhealthy"] += 1
+            self._discard(driver)
+        return None
+
+    def _reserve_slot(self):
+        # Called with the condition held. Waits until a new browser may be started (returns True)
+        # or another session returns one to the pool (returns False)
+        deadline = time.monotonic() + selenium_config.get("lease_timeout", 120)
+        while len(self.leases) + self.starting >= self.size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No browser became available within {selenium_config.get('lease_timeout')}s "
+                                   f"(pool size {self.size}, {len(self.leases)} leased)")
+            self.stats["waits"] += 1
+            self.condition.wait(remaining)
+            if self.idle:
+                return False
+        self.starting += 1
+        return True
+
+    def _start_driver(self, session):
+        # Chrome is started outside the lock so other sessions are not blocked meanwhile
+        try:
+            driver = PooledDriver(self.factory)
+        except Exception:
+            with self.condition:
+                self.starting -= 1
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.starting -= 1
+            self.stats["created"] += 1
+            self.leases[session] = driver
+        return driver
+
+    def release(self, session):
+        """Returns the session's browser to the pool, or closes it if it is due for recycling."""
+        with self.condition:
+            driver = self.leases.pop(session, None)
+            if driver is None:
+                return
+            if driver.navigations >= selenium_config.get("max_navigations", 50) or not driver.is_healthy():
+                self.stats["recycled"] += 1
+                self._discard(driver)
+            else:
+                driver.last_used = time.monotonic()
+                self.idle.append(driver)
+            self.condition.notify()
+
+    def record_navigation(self, wd):
+        """Counts a page load when the browser's URL has changed since the last call."""
+        with self.condition:
+            driver = next((d for d in list(self.leases.values()) + self.idle if d.wd is wd), None)
+        if driver is None:
+            return
+        url = wd.current_url
+        if url != driver.last_url:
+            driver.last_url = url
+            driver.navigations += 1
+        driver.last_used = time.monotonic()
+
+    def reap(self):
+        """Releases leases that have been idle for idle_timeout and closes idle browsers past that age."""
+        idle_timeout = selenium_config.get("idle_timeout", 300)
+        now = time.monotonic()
+        with self.condition:
+            for session, driver in list(self.leases.items()):
+                if now - driver.last_used > idle_timeout:
+                    self.release(session)
+            for driver in list(self.idle):
+                if now - driver.last_used > idle_timeout:
+                    self.idle.remove(driver)
+                    self.stats["reaped"] += 1
+                    self._discard(driver)
+
+    def close_all(self):
+        with self.condition:
+            drivers = list(self.leases.values()) + self.idle
+            self.leases.clear()
+            self.idle.clear()
+        for driver in drivers:
+            driver.quit()
+
+    def get_stats(self):
+        with self.condition:
+            return {**self.stats, "leased": len(self.leases), "idle": len(self.idle), "size": self.size}
+
+    def _discard(self, driver):
+        # Quitting Chrome can take a while; do it in the background
+        threading.Thread(target=driver.quit, daemon=True).start()
+
+    def _start_reaper(self):
+        if self._reaper:
+            return
+
+        def loop():
+            while True:
+                time.sleep(max(1.0, selenium_config.get("idle_timeout", 300) / 4))
+                self.reap()
+
+        self._reaper = threading.Thread(target=loop, name="webdriver-reaper", daemon=True)
+        self._reaper.start()
+
+
+def get_web_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WebDriverPool()
+            atexit.register(_pool.close_all)
+        return _pool
+
+
+def get_blocked_url_patterns(profile):
+    if profile == "full":
+        return []
+    patterns = []
+    for resource_type in selenium_config.get("blocked_resource_types", []):
+        for extension in RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+            patterns += [f"*.{extension}", f"*.{extension}?*"]
+    for domain in selenium_config.get("blocked_domains", []):
+        patterns.append(f"*://*{domain}/*")
+    return patterns
+
+
+def apply_browsing_profile(wd, profile, reload=True):
+    """
+    Switches the browser between the "full" and "text" profiles using CDP Network.setBlockedURLs.
+    When switching back to "full" with reload=True, the current page is reloaded so blocked resources appear.
+    """
+    if profile not in BROWSING_PROFILES:
+        raise ValueError(f"Unknown browsing profile '{profile}', expected one of {BROWSING_PROFILES}")
+
+    current = getattr(wd, "_browsing_profile", "full")
+    if profile == current:
+        return wd
+
+    wd.execute_cdp_cmd("Network.enable", {})
+    wd.execute_cdp_cmd("Network.setBlockedURLs", {"urls": get_blocked_url_patterns(profile)})
+    wd._browsing_profile = profile
+    print(f"Browsing profile set to '{profile}'.")
+
+    if reload and profile == "full" and wd.current_url.startswith("http"):
+        from .waits import wait_for_page_ready
+
+        wd.refresh()
+        wait_for_page_ready(wd, step="profile_switch")
+    return wd
+
+
+def get_web_driver(session=None, profile=None):
+    """
+    Returns the browser leased to the given session (any hashable key, e.g. the calling agent), or to the
+    current browser_session if none is given. Pass profile="text" or "full" to switch the browsing profile;
+    by default the session keeps its current one.
+    """
+    wd = get_web_driver_pool().acquire(session if session is not None else browser_session.get())
+    if profile:
+        apply_browsing_profile(wd, profile)
+    return wd
+
+
+def release_web_driver(session=None):
+    """Gives the session's browser back to the pool so other sessions can use it. A no-op without a lease."""
+    if _pool is None:
+        return
+    _pool.release(session if session is not None else browser_session.get())
+
+
 def set_web_driver(new_wd):
     # remove all popups
     js_script = """
@@ -145,10 +454,9 @@ def set_web_driver(new_wd):
 
     new_wd.execute_script("document.body.style.zoom='1.2'")
 
-    global wd
-    wd = new_wd
+    get_web_driver_pool().record_navigation(new_wd)
 
 
 def set_selenium_config(config):
     global selenium_config
-    selenium_config = config
+    selenium_config = {**selenium_config, **config}
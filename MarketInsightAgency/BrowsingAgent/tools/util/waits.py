@@ -0,0 +1,119 @@
+import os
+import time
+
+from shared_tools.metrics import registry
+
+# Default wait settings, overridable through environment variables
+wait_config = {
+    # Upper bound for a single wait; pages with ads or analytics may never go fully quiet
+    "timeout": float(os.getenv("BROWSER_WAIT_TIMEOUT", 3)),
+    # How long the DOM must go without mutations
+    "dom_quiet": float(os.getenv("BROWSER_WAIT_DOM_QUIET", 0.3)),
+    # How long the page must go without requests in flight or finishing
+    "network_idle": float(os.getenv("BROWSER_WAIT_NETWORK_IDLE", 0.5)),
+    # How long to give an action to start a navigation before treating an unchanged URL as settled
+    "navigation_grace": float(os.getenv("BROWSER_WAIT_NAVIGATION_GRACE", 0.5)),
+    # Requests open longer than this (long polling, streaming) no longer count as network activity
+    "long_request": float(os.getenv("BROWSER_WAIT_LONG_REQUEST", 2)),
+    "poll_interval": 0.1,
+}
+
+# Installs (once per document) a MutationObserver and fetch/XHR counters, then reports the page state.
+# Network activity is tracked in the page rather than through CDP Network events, which selenium only
+# exposes via performance logs; resource timing entries cover requests the counters cannot see.
+# Requests open longer than arguments[0] seconds and beacons (analytics) are treated as idle.
+STATE_SCRIPT = """
+if (!window.__pageWait) {
+    var state = window.__pageWait = {lastMutation: performance.now(), lastNetwork: performance.now(), pending: {}, nextId: 0};
+    new MutationObserver(function() { state.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+    var start = function() { var id = state.nextId++; state.pending[id] = performance.now(); return id; };
+    var done = function(id) { delete state.pending[id]; state.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            var id = start();
+            return originalFetch.apply(this, arguments).finally(function() { done(id); });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        var id = start();
+        this.addEventListener('loadend', function() { done(id); });
+        return originalSend.apply(this, arguments);
+    };
+}
+var state = window.__pageWait;
+var now = performance.now();
+var inFlight = 0;
+for (var id in state.pending) {
+    if (now - state.pending[id] < arguments[0] * 1000) inFlight++;
+}
+var lastResource = 0;
+performance.getEntriesByType('resource').forEach(function(r) {
+    if (r.initiatorType !== 'beacon' && r.responseEnd > lastResource) lastResource = r.responseEnd;
+});
+return {
+    readyState: document.readyState,
+    url: window.location.href,
+    sinceMutation: (now - state.lastMutation) / 1000,
+    sinceNetwork: (now - Math.max(state.lastNetwork, lastResource)) / 1000,
+    inFlight: inFlight
+};
+"""
+
+
+def wait_for_page_ready(wd, step="unknown", previous_url=None, timeout=None):
+    """
+    Waits until the current document is loaded (readyState complete), the DOM has stopped changing and there
+    is no network activity, or until the timeout. When previous_url is given and the URL is unchanged, the
+    action is also given navigation_grace seconds to start a navigation.
+
+    Returns a dict with the seconds waited, whether the wait timed out, whether the URL changed and the last state.
+    The wait time is recorded in the browser_wait_seconds histogram labelled by step.
+    """
+    timeout = wait_config["timeout"] if timeout is None else timeout
+    start = time.perf_counter()
+    state = {}
+    timed_out = True
+
+    while time.perf_counter() - start < timeout:
+        try:
+            state = wd.execute_script(STATE_SCRIPT, wait_config["long_request"]) or {}
+        except Exception:
+            # The document is being replaced; poll again once the new one is available
+            state = {}
+
+        elapsed = time.perf_counter() - start
+        url_changed = previous_url is not None and state.get("url") not in (None, previous_url)
+        if (
+            state.get("readyState") == "complete"
+            and state.get("sinceMutation", 0) >= wait_config["dom_quiet"]
+            and state.get("inFlight", 1) == 0
+            and state.get("sinceNetwork", 0) >= wait_config["network_idle"]
+            and (previous_url is None or url_changed or elapsed >= wait_config["navigation_grace"])
+        ):
+            timed_out = False
+            break
+        time.sleep(wait_config["poll_interval"])
+
+    waited = time.perf_counter() - start
+    registry.observe("browser_wait_seconds", waited, step=step, outcome="timeout" if timed_out else "ready")
+    return {
+        "waited": waited,
+        "timed_out": timed_out,
+        "url_changed": previous_url is not None and state.get("url") not in (None, previous_url),
+        "state": state,
+    }
+
+
+def format_wait(result):
+    if result["timed_out"]:
+        return f"Page was still loading after {result['waited']:.1f}s."
+    return f"Page ready after {result['waited']:.2f}s."
+
+
+def set_wait_config(config):
+    global wait_config
+    wait_config = {**wait_config, **config}
@@ -1,18 +1,24 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
+from typing import List, Optional
 import requests
 from bs4 import BeautifulSoup
-import time
+
+from shared_tools.crawler import crawl, format_crawl_stats
 
 class WebScrapingTool(BaseTool):
     """
     This tool utilizes web scraping libraries such as BeautifulSoup to extract data from competitor websites.
     It handles HTTP requests, parses HTML content, and extracts relevant information based on specified criteria.
-    The tool also manages errors and respects website crawling policies.
+    The tool also manages errors and respects website crawling policies (robots.txt and a per-site request rate).
+    It can scrape several pages at once and follow links within a competitor's site (e.g. a product catalog).
     """
 
-    url: str = Field(
-        ..., description="The URL of the website to scrape."
+    url: Optional[str] = Field(
+        None, description="The URL of the website to scrape."
+    )
+    urls: List[str] = Field(
+        default_factory=list, description="Additional URLs to scrape in the same job."
     )
     element: str = Field(
         ..., description="The HTML element to extract data from (e.g., 'div', 'span')."
@@ -20,31 +26,43 @@ class WebScrapingTool(BaseTool):
     class_name: str = Field(
         ..., description="The class name of the HTML element to target for data extraction."
     )
+    max_depth: int = Field(
+        0, description="How many links deep to follow links within the same site from the given URLs. 0 scrapes only the given URLs."
+    )
+    max_pages: int = Field(
+        50, description="Maximum number of pages to scrape in total."
+    )
 
     def run(self):
         """
-        Extracts data from the specified website URL.
+        Extracts data from the specified website URLs.
         Handles HTTP requests, parses HTML content, and extracts relevant information.
         """
         try:
-            # Respect website crawling policies by including a delay
-            time.sleep(1)
+            seeds = ([self.url] if self.url else []) + self.urls
+            if not seeds:
+                return "Please provide a url or urls to scrape."
 
-            # Send HTTP request to the specified URL
-            response = requests.get(self.url)
-            response.raise_for_status()
+            # Extract relevant information based on specified criteria
+            def extract(url, soup: BeautifulSoup):
+                return [element.get_text(strip=True) for element in soup.find_all(self.element, class_=self.class_name)]
 
-            # Parse HTML content using BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # The crawler rate-limits requests per site and skips pages disallowed by robots.txt
+            result = crawl(seeds, extract, max_depth=self.max_depth, max_pages=self.max_pages)
+            pages = result["pages"]
 
-            # Extract relevant information based on specified criteria
-            extracted_data = []
-            for element in soup.find_all(self.element, class_=self.class_name):
-                extracted_data.append(element.get_text(strip=True))
+            if len(seeds) == 1 and self.max_depth == 0:
+                page = pages[0]
+                if page["error"]:
+                    return f"Error during HTTP request: {page['error']}"
+                return page["data"]
 
-            return extracted_data
+            return {
+                "pages": {page["url"]: page["data"] if not page["error"] else f"Error: {page['error']}" for page in pages},
+                "stats": format_crawl_stats(result["stats"]),
+            }
 
         except requests.exceptions.RequestException as e:
             return f"Error during HTTP request: {e}"
         except Exception as e:
-            return f"An error occurred during web scraping: {e}"
\ No newline at end of file
+            return f"An error occurred during web scraping: {e}"
@@ -1,44 +1,66 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from typing import List, Optional
+
+from shared_tools.crawler import crawl, format_crawl_stats
 
 class WebScraperTool(BaseTool):
     """
     A tool for web scraping that extracts data from specified URLs using BeautifulSoup.
+    Several URLs are scraped concurrently, while requests to the same site are rate-limited and respect robots.txt.
     """
     
-    url: str = Field(
-        ..., 
+    url: Optional[str] = Field(
+        None,
         description="The URL to scrape data from"
     )
+
+    urls: List[str] = Field(
+        default_factory=list,
+        description="Additional URLs to scrape with the same selector"
+    )
     
     selector: str = Field(
         ..., 
         description="CSS selector to target specific elements"
     )
 
+    max_depth: int = Field(
+        default=0,
+        description="How many links deep to follow links within the same site. 0 scrapes only the given URLs."
+    )
+
+    max_pages: int = Field(
+        default=50,
+        description="Maximum number of pages to scrape in total"
+    )
+
     def run(self):
         """
-        Scrapes data from the specified URL using the given CSS selector.
-        Returns the extracted data as a list.
+        Scrapes data from the specified URLs using the given CSS selector.
+        Returns the extracted data as a list, or a list per URL when several pages are scraped.
         """
         try:
-            # Send GET request to the URL
-            response = requests.get(self.url)
-            response.raise_for_status()
-            
-            # Parse HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find elements using the selector
-            elements = soup.select(self.selector)
-            
-            # Extract text from elements
-            data = [element.text.strip() for element in elements]
-            
-            return data
+            seeds = ([self.url] if self.url else []) + self.urls
+            if not seeds:
+                return "Error scraping data: no url given"
+
+            # Extract text from the elements matching the selector
+            def extract(url, soup):
+                return [element.text.strip() for element in soup.select(self.selector)]
+
+            result = crawl(seeds, extract, max_depth=self.max_depth, max_pages=self.max_pages)
+            pages = result["pages"]
+
+            if len(seeds) == 1 and self.max_depth == 0:
+                if pages[0]["error"]:
+                    return f"Error scraping data: {pages[0]['error']}"
+                return pages[0]["data"]
+
+            return {
+                "pages": {page["url"]: page["data"] if not page["error"] else f"Error: {page['error']}" for page in pages},
+                "stats": format_crawl_stats(result["stats"]),
+            }
             
         except Exception as e:
             return f"Error scraping data: {str(e)}"
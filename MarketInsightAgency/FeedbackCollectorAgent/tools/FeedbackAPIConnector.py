@@ -3,6 +3,8 @@ from pydantic import Field
 import requests
 import os
 
+from shared_tools.http_client import get_http_client
+
 # Constants for API access
 INTERCOM_API_URL = "https://api.intercom.io"
 INTERCOM_ACCESS_TOKEN = os.getenv("INTERCOM_ACCESS_TOKEN")
@@ -34,7 +36,7 @@ class FeedbackAPIConnector(BaseTool):
             }
 
             # Make the API request
-            response = requests.get(f"{INTERCOM_API_URL}{self.endpoint}", headers=headers, params=self.params)
+            response = get_http_client().get(f"{INTERCOM_API_URL}{self.endpoint}", headers=headers, params=self.params)
             response.raise_for_status()
 
             # Return the JSON response data
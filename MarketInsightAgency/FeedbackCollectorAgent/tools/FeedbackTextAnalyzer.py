@@ -1,13 +1,6 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-import spacy
-
-# Ensure necessary NLTK data is downloaded
-nltk.download('vader_lexicon')
+from shared_tools.nlp import get_sentiment_analyzer, get_spacy_model
 
 class FeedbackTextAnalyzer(BaseTool):
     """
@@ -29,7 +22,7 @@ class FeedbackTextAnalyzer(BaseTool):
         Identifies key themes, sentiments, and actionable insights.
         """
         # Load spaCy model for text preprocessing
-        nlp = spacy.load("en_core_web_sm")
+        nlp = get_spacy_model("en_core_web_sm")
 
         # Preprocess feedback data
         processed_feedback = [self._preprocess_text(nlp, text) for text in self.feedback_data]
@@ -56,7 +49,7 @@ class FeedbackTextAnalyzer(BaseTool):
         """
         Analyzes the sentiment of the text using NLTK's SentimentIntensityAnalyzer.
         """
-        sia = SentimentIntensityAnalyzer()
+        sia = get_sentiment_analyzer()
         sentiment_scores = sia.polarity_scores(text)
         return sentiment_scores
 
@@ -64,6 +57,9 @@ class FeedbackTextAnalyzer(BaseTool):
         """
         Extracts key themes from the feedback data using LDA.
         """
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation
+
         vectorizer = CountVectorizer(max_df=0.95, min_df=2, stop_words='english')
         dtm = vectorizer.fit_transform(processed_feedback)
 
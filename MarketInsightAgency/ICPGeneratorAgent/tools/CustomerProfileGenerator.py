@@ -1,9 +1,5 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
 
 class CustomerProfileGenerator(BaseTool):
     """
@@ -24,6 +20,12 @@ class CustomerProfileGenerator(BaseTool):
         Cleans, preprocesses, and analyzes the provided CRM and demographic data.
         Identifies patterns and segments, and generates detailed customer profiles.
         """
+        # Heavy dependencies are imported on first use to keep agent startup fast
+        import pandas as pd
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import PCA
+
         # Load data into a Pandas DataFrame
         data_io = pd.io.common.StringIO(self.data)
         df = pd.read_csv(data_io)
@@ -52,6 +54,8 @@ class CustomerProfileGenerator(BaseTool):
         """
         Cleans and preprocesses the data.
         """
+        import pandas as pd
+
         # Drop missing values
         df = df.dropna()
 
@@ -3,6 +3,8 @@ from pydantic import Field
 import requests
 import os
 
+from shared_tools.http_client import get_http_client
+
 # Constants for API access
 ECONOMIC_API_URL = "https://api.economicdata.com"  # Replace with actual API URL
 ECONOMIC_API_KEY = os.getenv("ECONOMIC_API_KEY")
@@ -34,7 +36,7 @@ class EconomicDataFetcher(BaseTool):
             }
 
             # Make the API request
-            response = requests.get(f"{ECONOMIC_API_URL}{self.endpoint}", headers=headers, params=self.params)
+            response = get_http_client().get(f"{ECONOMIC_API_URL}{self.endpoint}", headers=headers, params=self.params)
             response.raise_for_status()
 
             # Return the JSON response data
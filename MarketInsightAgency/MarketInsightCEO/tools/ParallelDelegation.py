@@ -0,0 +1,263 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from agency_swarm.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from shared_tools.metrics import registry
+
+# Default delegation settings, overridable through environment variables
+delegation_config = {
+    "max_parallel": int(os.getenv("DELEGATION_MAX_PARALLEL", 4)),
+    "task_timeout": float(os.getenv("DELEGATION_TASK_TIMEOUT", 600)),
+    # Seconds to wait for a timed-out task's worker to stop after its run is cancelled
+    "cancel_grace": float(os.getenv("DELEGATION_CANCEL_GRACE", 30)),
+}
+
+
+class DelegationTask(BaseModel):
+    recipient: str = Field(
+        ...,
+        description="Name of the agent that should perform this sub-task (e.g. 'CompetitorTrackingAgent')"
+    )
+    message: str = Field(
+        ...,
+        description="The sub-task for the recipient, including all context it needs to complete it on its own"
+    )
+    additional_instructions: Optional[str] = Field(
+        default=None,
+        description="Optional extra instructions for the recipient agent"
+    )
+
+
+class ParallelDelegation(BaseTool):
+    """
+    Sends several independent sub-tasks to other agents at the same time and returns all of their answers
+    in one merged report. Use this instead of sending messages one by one whenever the sub-tasks do not depend
+    on each other's results (e.g. competitor tracking, sentiment analysis and ICP generation for the same product).
+    Tasks for the same agent are run one after another; tasks for different agents run concurrently.
+    """
+
+    tasks: List[DelegationTask] = Field(
+        ...,
+        description="The independent sub-tasks to dispatch, one entry per recipient agent and message"
+    )
+    timeout: Optional[float] = Field(
+        default=None,
+        description="Maximum seconds each sub-task may run once started. Defaults to DELEGATION_TASK_TIMEOUT."
+    )
+    max_parallel: Optional[int] = Field(
+        default=None,
+        description="Maximum number of sub-tasks running at once. Defaults to DELEGATION_MAX_PARALLEL."
+    )
+
+    class ToolConfig:
+        one_call_at_a_time = True
+
+    def run(self) -> str:
+        try:
+            threads = self._get_threads()
+            unknown = [task.recipient for task in self.tasks if task.recipient not in threads]
+            if unknown:
+                return (f"Error in parallel delegation: unknown recipient(s) {', '.join(sorted(set(unknown)))}. "
+                        f"Available agents: {', '.join(sorted(threads))}")
+
+            traces = self.delegate(threads)
+            return self._format_output(traces)
+
+        except Exception as e:
+            return f"Error in parallel delegation: {str(e)}"
+
+    def _get_threads(self) -> Dict[str, Any]:
+        # The SendMessage tool the agency creates for the caller carries the agency's threads. Reading them from
+        # the caller agent does not depend on how this module was imported (tools_folder loads it by file path).
+        for tool in getattr(self._caller_agent, "tools", []):
+            agents_and_threads = getattr(tool, "_agents_and_threads", None)
+            if agents_and_threads and self._caller_agent.name in agents_and_threads:
+                return agents_and_threads[self._caller_agent.name]
+        raise RuntimeError("the calling agent has no agents to delegate to in its agency")
+
+    def delegate(self, threads: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Runs every task on its recipient's thread and returns one trace per task with status, output,
+        started/finished offsets (seconds since dispatch) and duration.
+        """
+        timeout = self.timeout or delegation_config["task_timeout"]
+        max_parallel = max(1, self.max_parallel or delegation_config["max_parallel"])
+
+        # An agent thread can only have one active run, so tasks for the same recipient are serialized
+        recipient_locks = {task.recipient: threading.Lock() for task in self.tasks}
+        cancelled = set()
+        traces = [
+            {"index": index, "recipient": task.recipient, "message": task.message, "status": "queued",
+             "output": None, "started": None, "finished": None, "duration": None}
+            for index, task in enumerate(self.tasks)
+        ]
+        dispatched = time.perf_counter()
+
+        def execute(index: int, task: DelegationTask):
+            with recipient_locks[task.recipient]:
+                if index in cancelled:
+                    return
+                traces[index]["started"] = time.perf_counter() - dispatched
+                traces[index]["status"] = "running"
+                output = _drain(threads[task.recipient].get_completion(
+                    message=task.message,
+                    additional_instructions=task.additional_instructions,
+                    parent_run_id=getattr(self._tool_call, "id", None),
+                ))
+            return output
+
+        executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="delegation")
+        futures = {executor.submit(execute, index, task): index for index, task in enumerate(self.tasks)}
+        pending = set(futures)
+        timed_out = []
+
+        try:
+            while pending:
+                # Wait until the next task finishes or the earliest running task reaches its deadline
+                now = time.perf_counter() - dispatched
+                deadlines = [traces[futures[f]]["started"] + timeout for f in pending
+                             if traces[futures[f]]["started"] is not None]
+                wait_for = max(0.0, min(deadlines) - now) if deadlines else None
+                done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    trace = traces[futures[future]]
+                    trace["finished"] = time.perf_counter() - dispatched
+                    try:
+                        trace["output"] = future.result()
+                        trace["status"] = "ok"
+                    except Exception as e:
+                        trace["output"] = f"Error: {str(e)}"
+                        trace["status"] = "error"
+
+                now = time.perf_counter() - dispatched
+                for future in list(pending):
+                    trace = traces[futures[future]]
+                    if trace["started"] is None or now - trace["started"] < timeout:
+                        continue
+                    # Cancel the recipient's run so its thread accepts new messages, stop waiting for it
+                    # and skip the tasks that would have to wait for the same recipient afterwards
+                    trace["status"] = "timeout"
+                    trace["finished"] = now
+                    pending.discard(future)
+                    timed_out.append(future)
+                    _cancel_run(threads[trace["recipient"]])
+                    for other in list(pending):
+                        other_trace = traces[futures[other]]
+                        if other_trace["recipient"] == trace["recipient"] and other_trace["started"] is None:
+                            cancelled.add(other_trace["index"])
+                            other_trace["status"] = "skipped"
+                            pending.discard(other)
+            # Let the cancelled runs wind down, so the recipients' threads are idle again before the CEO
+            # sends them anything else
+            if timed_out:
+                _, still_running = wait(timed_out, timeout=delegation_config["cancel_grace"])
+                for future in still_running:
+                    print(f"Delegated task to {traces[futures[future]]['recipient']} is still running after cancellation")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for trace in traces:
+            if trace["started"] is not None and trace["finished"] is not None:
+                trace["duration"] = trace["finished"] - trace["started"]
+                registry.observe("delegation_task_seconds", trace["duration"],
+                                 recipient=trace["recipient"], status=trace["status"])
+            registry.inc("delegation_tasks_total", recipient=trace["recipient"], status=trace["status"])
+
+        return traces
+
+    def _format_output(self, traces: List[Dict[str, Any]]) -> str:
+        wall_time = max((trace["finished"] or 0.0) for trace in traces)
+        sequential_time = sum(trace["duration"] or 0.0 for trace in traces)
+        # The critical path ends with the task that finished last; its queue wait counts towards it
+        critical = max(traces, key=lambda trace: trace["finished"] or 0.0)
+
+        output = "# Delegation Results\n\n"
+        for trace in traces:
+            output += f"## {trace['index'] + 1}. {trace['recipient']} ({trace['status']})\n"
+            output += f"**Task:** {trace['message']}\n\n"
+            if trace["status"] == "timeout":
+                output += "The agent did not answer within the time limit.\n\n"
+            elif trace["status"] == "skipped":
+                output += "Skipped because an earlier task for the same agent timed out.\n\n"
+            else:
+                output += f"{trace['output']}\n\n"
+
+        output += "## Timing\n"
+        output += "| Task | Agent | Status | Started at (s) | Duration (s) | Finished at (s) |\n"
+        output += "|---|---|---|---|---|---|\n"
+        for trace in traces:
+            output += (f"| {trace['index'] + 1} | {trace['recipient']} | {trace['status']} | "
+                       f"{_seconds(trace['started'])} | {_seconds(trace['duration'])} | {_seconds(trace['finished'])} |\n")
+
+        output += f"\n- Wall time: {wall_time:.1f}s (sequential would take ~{sequential_time:.1f}s)\n"
+        output += (f"- Critical path: task {critical['index'] + 1} ({critical['recipient']}), "
+                   f"started at {_seconds(critical['started'])}s and ran {_seconds(critical['duration'])}s\n")
+        return output
+
+
+def _drain(completion) -> str:
+    """Consumes a thread completion generator and returns its final output."""
+    try:
+        while True:
+            next(completion)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _cancel_run(thread) -> None:
+    """
+    Asks OpenAI to cancel the thread's active run. Only the API is called: the worker still inside the
+    thread's get_completion sees the cancelled status on its next poll and returns, so thread state is only
+    ever changed by that worker.
+    """
+    run = getattr(thread, "_run", None)
+    if run is None or run.status in thread.terminal_states:
+        return
+    try:
+        thread.client.beta.threads.runs.cancel(thread_id=thread.id, run_id=run.id)
+    except Exception as e:
+        print(f"Error cancelling delegated run: {str(e)}")
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+if __name__ == "__main__":
+    class FakeThread:
+        def __init__(self, delay):
+            self.delay = delay
+
+        def get_completion(self, message, **kwargs):
+            time.sleep(self.delay)
+            yield message
+            return f"Done: {message}"
+
+    class FakeSendMessage:
+        _agents_and_threads = {"MarketInsightCEO": {
+            "CompetitorTrackingAgent": FakeThread(1.0),
+            "SentimentAnalysisAgent": FakeThread(0.5),
+            "ICPGeneratorAgent": FakeThread(3.0),
+        }}
+
+    class FakeAgent:
+        name = "MarketInsightCEO"
+        tools = [FakeSendMessage]
+
+    tool = ParallelDelegation(
+        tasks=[
+            DelegationTask(recipient="CompetitorTrackingAgent", message="Track competitors of Notion"),
+            DelegationTask(recipient="SentimentAnalysisAgent", message="Analyze sentiment for Notion"),
+            DelegationTask(recipient="SentimentAnalysisAgent", message="Analyze sentiment for Obsidian"),
+            DelegationTask(recipient="ICPGeneratorAgent", message="Generate the ICP for Notion"),
+        ],
+        timeout=2.0
+    )
+    tool._caller_agent = FakeAgent()
+    print(tool.run())
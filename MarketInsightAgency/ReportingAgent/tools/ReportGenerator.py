@@ -1,8 +1,6 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field, ConfigDict
-import pandas as pd
 from typing import Any
-import matplotlib.pyplot as plt
 from jinja2 import Environment, FileSystemLoader
 import os
 
@@ -33,6 +31,9 @@ class ReportGenerator(BaseTool):
         """
         Generate a report with visualizations from the provided data.
         """
+        # Heavy dependencies are imported on first use to keep agent startup fast
+        import pandas as pd
+
         # Convert data to DataFrame if it's not already
         if not isinstance(self.data, pd.DataFrame):
             try:
@@ -69,6 +70,8 @@ class ReportGenerator(BaseTool):
         """
         Create visualizations from the data and return their file paths.
         """
+        import matplotlib.pyplot as plt
+
         viz_paths = []
         
         # Create visualizations directory
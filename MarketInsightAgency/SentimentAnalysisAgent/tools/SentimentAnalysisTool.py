@@ -1,11 +1,6 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-import spacy
-
-# Ensure necessary NLTK data is downloaded
-nltk.download('vader_lexicon')
+from shared_tools.nlp import get_sentiment_analyzer, get_spacy_model
 
 class SentimentAnalysisTool(BaseTool):
     """
@@ -24,14 +19,14 @@ class SentimentAnalysisTool(BaseTool):
         Processes text to identify positive, negative, and neutral sentiments.
         """
         # Load spaCy model for text preprocessing
-        nlp = spacy.load("en_core_web_sm")
+        nlp = get_spacy_model("en_core_web_sm")
 
         # Preprocess and tokenize text using spaCy
         doc = nlp(self.text)
         processed_text = " ".join([token.lemma_ for token in doc if not token.is_stop])
 
         # Initialize NLTK's SentimentIntensityAnalyzer
-        sia = SentimentIntensityAnalyzer()
+        sia = get_sentiment_analyzer()
 
         # Perform sentiment analysis
         sentiment_scores = sia.polarity_scores(processed_text)
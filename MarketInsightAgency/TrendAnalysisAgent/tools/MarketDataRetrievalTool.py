@@ -1,9 +1,9 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import requests
-import pandas as pd
 import os
 
+from shared_tools.http_client import get_http_client
+
 # Define your Alpha Vantage API key as a global constant
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 
@@ -28,6 +28,8 @@ class MarketDataRetrievalTool(BaseTool):
         Retrieves market data for the specified stock symbol and function.
         Returns the data as a pandas DataFrame.
         """
+        import pandas as pd
+
         # Construct the API request URL
         base_url = "https://www.alphavantage.co/query"
         params = {
@@ -40,7 +42,7 @@ class MarketDataRetrievalTool(BaseTool):
             params["interval"] = self.interval
 
         # Make the API request
-        response = requests.get(base_url, params=params)
+        response = get_http_client().get(base_url, params=params)
         data = response.json()
 
         # Parse the JSON response into a pandas DataFrame
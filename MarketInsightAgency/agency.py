@@ -1,18 +1,11 @@
 import sys
+import threading
+from importlib import import_module
 from pathlib import Path
 
 # Add the project root to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from agency_swarm import Agency, set_openai_key
-from MarketAnalysisAgent.MarketAnalysisAgent import MarketAnalysisAgent
-from MarketInsightCEO.MarketInsightCEO import MarketInsightCEO
-from CompetitorTrackingAgent.CompetitorTrackingAgent import CompetitorTrackingAgent
-from SentimentAnalysisAgent.SentimentAnalysisAgent import SentimentAnalysisAgent
-from ICPGeneratorAgent.ICPGeneratorAgent import ICPGeneratorAgent
-from FeedbackCollectorAgent.FeedbackCollectorAgent import FeedbackCollectorAgent
-from ReportingAgent.ReportingAgent import ReportingAgent
-from BrowsingAgent.BrowsingAgent import BrowsingAgent
 import os
 from dotenv import load_dotenv
 
@@ -26,62 +19,128 @@ api_key = os.getenv('OPENAI_API_KEY')
 if not api_key:
     raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
 
-# Set OpenAI API key
-set_openai_key(api_key)
-
-# Initialize agents
-ceo = MarketInsightCEO()
-market_analysis = MarketAnalysisAgent()
-competitor_tracking = CompetitorTrackingAgent()
-sentiment_analysis = SentimentAnalysisAgent()
-icp_generator = ICPGeneratorAgent()
-feedback_collector = FeedbackCollectorAgent()
-reporting = ReportingAgent()
-browsing_agent = BrowsingAgent()
-
-# Set common configurations for all agents
-agents = [
-    ceo,
-    market_analysis,
-    competitor_tracking,
-    sentiment_analysis,
-    icp_generator,
-    feedback_collector,
-    reporting,
-    browsing_agent
-]
-
-for agent in agents:
-    agent.temperature = float(os.getenv('TEMPERATURE', 0.7))
-    agent.model = os.getenv('OPENAI_MODEL', "gpt-4-1106-preview")
-
-# Create agency with communication flows
-agency = Agency(
-    [
-        ceo,  # CEO is the entry point
-        browsing_agent,
+# Agent classes by "module:class". They are imported when the agency is first built, not when this
+# module is imported, so the heavy agent and tool dependencies stay out of cold start.
+AGENT_CLASSES = {
+    "ceo": "MarketInsightCEO.MarketInsightCEO:MarketInsightCEO",
+    "market_analysis": "MarketAnalysisAgent.MarketAnalysisAgent:MarketAnalysisAgent",
+    "competitor_tracking": "CompetitorTrackingAgent.CompetitorTrackingAgent:CompetitorTrackingAgent",
+    "sentiment_analysis": "SentimentAnalysisAgent.SentimentAnalysisAgent:SentimentAnalysisAgent",
+    "icp_generator": "ICPGeneratorAgent.ICPGeneratorAgent:ICPGeneratorAgent",
+    "feedback_collector": "FeedbackCollectorAgent.FeedbackCollectorAgent:FeedbackCollectorAgent",
+    "reporting": "ReportingAgent.ReportingAgent:ReportingAgent",
+    "browsing_agent": "BrowsingAgent.BrowsingAgent:BrowsingAgent",
+}
+
+_agency = None
+# agency_swarm reads and rewrites ./settings.json without locking while agents are set up, so agencies
+# built concurrently (server sessions, run_briefs worker threads) must be built one at a time
+_build_lock = threading.Lock()
+
+
+def load_agent_class(key):
+    module_name, class_name = AGENT_CLASSES[key].split(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def build_agency():
+    """Creates a new, independent agency with freshly constructed agents. Concurrent calls are serialized."""
+    with _build_lock:
+        return _build_agency()
+
+
+def _build_agency():
+    from agency_swarm import Agency, set_openai_key
+    from shared_tools.metrics import setup_metrics
+
+    # Set OpenAI API key
+    set_openai_key(api_key)
+
+    # Initialize agents
+    ceo = load_agent_class("ceo")()
+    market_analysis = load_agent_class("market_analysis")()
+    competitor_tracking = load_agent_class("competitor_tracking")()
+    sentiment_analysis = load_agent_class("sentiment_analysis")()
+    icp_generator = load_agent_class("icp_generator")()
+    feedback_collector = load_agent_class("feedback_collector")()
+    reporting = load_agent_class("reporting")()
+    browsing_agent = load_agent_class("browsing_agent")()
+
+    # Set common configurations for all agents
+    agents = [
+        ceo,
+        market_analysis,
         competitor_tracking,
         sentiment_analysis,
         icp_generator,
         feedback_collector,
-        market_analysis,
         reporting,
-        [ceo, competitor_tracking],  # CEO can communicate with CompetitorTrackingAgent
-        [ceo, sentiment_analysis],   # CEO can communicate with SentimentAnalysisAgent
-        [ceo, icp_generator],        # CEO can communicate with ICPGeneratorAgent
-        [ceo, feedback_collector],   # CEO can communicate with FeedbackCollectorAgent
-        [ceo, market_analysis],      # CEO can communicate with MarketAnalysisAgent
-        [ceo, reporting],            # CEO can communicate with ReportingAgent
-        [ceo, browsing_agent],       # CEO can communicate with BrowsingAgent
-        [competitor_tracking, market_analysis],  # CompetitorTrackingAgent can communicate with MarketAnalysisAgent
-        [sentiment_analysis, market_analysis],   # SentimentAnalysisAgent can communicate with MarketAnalysisAgent
-        [market_analysis, reporting],            # MarketAnalysisAgent can communicate with ReportingAgent
-        [browsing_agent, market_analysis],       # BrowsingAgent can communicate with MarketAnalysisAgent
-    ],
-    shared_instructions='./agency_manifesto.md',
-    max_prompt_tokens=int(os.getenv('MAX_TOKENS', 4000)),
-    temperature=float(os.getenv('TEMPERATURE', 0.7))
-)
+        browsing_agent
+    ]
+
+    for agent in agents:
+        agent.temperature = float(os.getenv('TEMPERATURE', 0.7))
+        agent.model = os.getenv('OPENAI_MODEL', "gpt-4-1106-preview")
+
+    # Create agency with communication flows
+    agency = Agency(
+        [
+            ceo,  # CEO is the entry point
+            browsing_agent,
+            competitor_tracking,
+            sentiment_analysis,
+            icp_generator,
+            feedback_collector,
+            market_analysis,
+            reporting,
+            [ceo, competitor_tracking],  # CEO can communicate with CompetitorTrackingAgent
+            [ceo, sentiment_analysis],   # CEO can communicate with SentimentAnalysisAgent
+            [ceo, icp_generator],        # CEO can communicate with ICPGeneratorAgent
+            [ceo, feedback_collector],   # CEO can communicate with FeedbackCollectorAgent
+            [ceo, market_analysis],      # CEO can communicate with MarketAnalysisAgent
+            [ceo, reporting],            # CEO can communicate with ReportingAgent
+            [ceo, browsing_agent],       # CEO can communicate with BrowsingAgent
+            [competitor_tracking, market_analysis],  # CompetitorTrackingAgent can communicate with MarketAnalysisAgent
+            [sentiment_analysis, market_analysis],   # SentimentAnalysisAgent can communicate with MarketAnalysisAgent
+            [market_analysis, reporting],            # MarketAnalysisAgent can communicate with ReportingAgent
+            [browsing_agent, market_analysis],       # BrowsingAgent can communicate with MarketAnalysisAgent
+        ],
+        shared_instructions='./agency_manifesto.md',
+        max_prompt_tokens=int(os.getenv('MAX_TOKENS', 4000)),
+        temperature=float(os.getenv('TEMPERATURE', 0.7))
+    )
+
+    # Instrument tool runs and start the metrics exporters when METRICS_ENABLED is set
+    setup_metrics(agents)
+
+    return agency
+
+
+def release_agency(agency):
+    """
+    Gives the browsers leased by the agency's agents back to the pool. Call it when a server session or a
+    brief is done with the agency; otherwise the leases only expire after BROWSER_IDLE_TIMEOUT.
+    """
+    from BrowsingAgent.tools.util.selenium import release_web_driver
+
+    for agent in agency.agents:
+        release_web_driver(agent)
+
+
+def get_agency():
+    """Returns the process-wide agency, building it on first use."""
+    global _agency
+    if _agency is None:
+        _agency = build_agency()
+    return _agency
+
+
+def __getattr__(name):
+    # Keeps `from agency import agency` working while deferring construction until it is accessed
+    if name == "agency":
+        return get_agency()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
-    agency.demo_gradio()
\ No newline at end of file
+    get_agency().demo_gradio()
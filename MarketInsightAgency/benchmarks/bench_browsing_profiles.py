@@ -0,0 +1,153 @@
+"""
+Compares page load time and bytes transferred between the "full" and "text" browsing profiles on a local
+fixture site (text, images, a web font, a video and a third-party tracker script). Requires Chrome.
+
+    python benchmarks/bench_browsing_profiles.py
+    python benchmarks/bench_browsing_profiles.py --runs 10 --latency 0.05
+"""
+import argparse
+import os
+import random
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BrowsingAgent.tools.util.selenium import (apply_browsing_profile, get_web_driver, release_web_driver,
+                                               selenium_config, set_selenium_config)
+from BrowsingAgent.tools.util.waits import wait_for_page_ready
+
+# *.localhost resolves to the loopback interface, so this stands in for a third-party tracker domain
+TRACKER_DOMAIN = "tracker-fixture.localhost"
+
+
+def _png(width: int, height: int) -> bytes:
+    """A valid PNG of random pixels, which does not compress."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + os.urandom(width * 3) for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def build_fixture_site(directory: Path, port: int, images: int = 20) -> None:
+    random.seed(0)
+    paragraphs = "\n".join(
+        f"<p>Paragraph {i}: " + " ".join(random.choice(["market", "growth", "pricing", "customer", "segment",
+                                                         "revenue", "churn", "adoption"]) for _ in range(80)) + "</p>"
+        for i in range(30)
+    )
+    gallery = "\n".join(f'<img src="img/photo{i}.png" width="200">' for i in range(images))
+    (directory / "index.html").write_text(f"""<!doctype html>
+<html><head><title>Fixture</title>
+<style>@font-face {{ font-family: Fixture; src: url(fonts/fixture.woff2); }} body {{ font-family: Fixture, sans-serif; }}</style>
+<script src="http://{TRACKER_DOMAIN}:{port}/tracker.js"></script>
+</head><body>
+<h1>Market report fixture</h1>
+{paragraphs}
+{gallery}
+<video src="media/clip.mp4" preload="auto"></video>
+</body></html>""")
+
+    (directory / "img").mkdir()
+    for i in range(images):
+        (directory / "img" / f"photo{i}.png").write_bytes(_png(160, 160))
+    (directory / "fonts").mkdir()
+    (directory / "fonts" / "fixture.woff2").write_bytes(os.urandom(150_000))
+    (directory / "media").mkdir()
+    (directory / "media" / "clip.mp4").write_bytes(os.urandom(1_500_000))
+    (directory / "tracker.js").write_text("window.trackerLoaded = true;\n" + "// padding\n" * 5000)
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+    bytes_served = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "content-length":
+            with FixtureHandler.lock:
+                FixtureHandler.bytes_served += int(value)
+        super().send_header(keyword, value)
+
+    def do_GET(self):
+        # Simulated network round trip
+        time.sleep(self.latency)
+        super().do_GET()
+
+
+def measure(wd, url: str, profile: str):
+    apply_browsing_profile(wd, profile, reload=False)
+    wd.get("about:blank")
+    FixtureHandler.bytes_served = 0
+
+    start = time.perf_counter()
+    wd.get(url)
+    wait_for_page_ready(wd, step="benchmark")
+    ready = time.perf_counter() - start
+
+    timing = wd.execute_script("""
+        var nav = performance.getEntriesByType('navigation')[0];
+        var resources = performance.getEntriesByType('resource');
+        return {load: nav.loadEventEnd / 1000, requests: resources.length + 1};
+    """)
+    return {"load": timing["load"], "ready": ready, "requests": timing["requests"], "bytes": FixtureHandler.bytes_served}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the full and text browsing profiles.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.03, help="Simulated seconds per request")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    set_selenium_config({"blocked_domains": selenium_config["blocked_domains"] + [TRACKER_DOMAIN]})
+    FixtureHandler.latency = args.latency
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_fixture_site(Path(directory), args.port)
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), partial(FixtureHandler, directory=directory))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        wd = get_web_driver("benchmark")
+        wd.execute_cdp_cmd("Network.enable", {})
+        wd.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        url = f"http://127.0.0.1:{args.port}/index.html"
+
+        try:
+            results = {profile: [] for profile in ("full", "text")}
+            for _ in range(args.runs):
+                # Alternate profiles so both see the same conditions
+                for profile in results:
+                    results[profile].append(measure(wd, url, profile))
+        finally:
+            release_web_driver("benchmark")
+            server.shutdown()
+
+    print(f"# Browsing profiles ({args.runs} runs, {args.latency * 1000:.0f} ms simulated latency per request)\n")
+    print("| Profile | Load event (s) | Ready (s) | Requests | Bytes transferred |")
+    print("|---|---|---|---|---|")
+    for profile, samples in results.items():
+        print(f"| {profile} | {statistics.median(s['load'] for s in samples):.2f} "
+              f"| {statistics.median(s['ready'] for s in samples):.2f} "
+              f"| {statistics.median(s['requests'] for s in samples):.0f} "
+              f"| {statistics.median(s['bytes'] for s in samples) / 1024:.0f} KiB |")
+
+    full_bytes = statistics.median(s["bytes"] for s in results["full"])
+    text_bytes = statistics.median(s["bytes"] for s in results["text"])
+    full_ready = statistics.median(s["ready"] for s in results["full"])
+    text_ready = statistics.median(s["ready"] for s in results["text"])
+    print(f"\nText profile: {100 * (1 - text_bytes / full_bytes):.0f}% fewer bytes, "
+          f"{full_ready / text_ready:.1f}x faster to ready")
@@ -0,0 +1,78 @@
+"""
+Cold-start benchmark for the agency. Each run starts a fresh interpreter and times `import agency`
+(and optionally building the agency), then compares the median against a stored baseline.
+
+    python benchmarks/bench_cold_start.py                      # compare against the baseline
+    python benchmarks/bench_cold_start.py --update-baseline    # record a new baseline
+    python benchmarks/bench_cold_start.py --build              # include agent construction (needs a valid OPENAI_API_KEY)
+
+Exits with status 1 when the median is more than --tolerance slower than the baseline.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "cold_start_baseline.json"
+
+TIMING_SCRIPT = """
+import time
+start = time.perf_counter()
+import agency
+imported = time.perf_counter()
+if {build}:
+    agency.build_agency()
+built = time.perf_counter()
+print(imported - start, built - start)
+"""
+
+
+def measure(build: bool = False):
+    env = {**os.environ}
+    env.setdefault("OPENAI_API_KEY", "sk-cold-start-benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-c", TIMING_SCRIPT.format(build=build)],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start failed:\n{completed.stderr[-2000:]}")
+    import_time, total_time = map(float, completed.stdout.split()[-2:])
+    return import_time, total_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agency cold-start time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--build", action="store_true", help="Include agency construction in the measurement")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown over the baseline (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    metric = "build" if args.build else "import"
+    samples = [measure(args.build)[1 if args.build else 0] for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(f"Cold start ({metric}): median {median * 1000:.0f} ms, "
+          f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms over {args.runs} runs")
+
+    baselines = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    if args.update_baseline:
+        baselines[metric] = median
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Baseline for '{metric}' updated in {BASELINE_PATH}")
+        sys.exit(0)
+
+    if metric not in baselines:
+        print(f"No baseline for '{metric}' yet; run with --update-baseline to record one.")
+        sys.exit(0)
+
+    limit = baselines[metric] * (1 + args.tolerance)
+    if median > limit:
+        print(f"REGRESSION: {median * 1000:.0f} ms exceeds baseline {baselines[metric] * 1000:.0f} ms "
+              f"by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print(f"OK: within {args.tolerance:.0%} of baseline {baselines[metric] * 1000:.0f} ms")
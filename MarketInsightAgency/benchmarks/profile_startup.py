@@ -0,0 +1,76 @@
+"""
+Per-module import time report for agency startup, based on `python -X importtime`.
+
+    python benchmarks/profile_startup.py             # profile `import agency`
+    python benchmarks/profile_startup.py --build     # also build the agency (needs a valid OPENAI_API_KEY)
+    python benchmarks/profile_startup.py --top 40 --json startup_profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def profile_imports(build: bool = False):
+    """Runs a fresh interpreter with -X importtime and returns one entry per imported module."""
+    code = "import agency; agency.build_agency()" if build else "import agency"
+    env = {**os.environ}
+    env.setdefault("OPENAI_API_KEY", "sk-startup-profile")
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{completed.stderr[-2000:]}")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        # Format: "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def top_level_packages(modules):
+    """Sums self time per top-level package (e.g. all of pandas.*)."""
+    totals = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + module["self_ms"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report per-module import time for agency startup.")
+    parser.add_argument("--build", action="store_true", help="Also construct the agency and its agents")
+    parser.add_argument("--top", type=int, default=25, help="Number of entries to show")
+    parser.add_argument("--json", help="Write the full profile to this file")
+    args = parser.parse_args()
+
+    modules = profile_imports(args.build)
+    total_ms = sum(module["self_ms"] for module in modules)
+
+    print(f"# Startup import profile ({len(modules)} modules, {total_ms:.1f} ms total)\n")
+    print("## Slowest modules (cumulative)")
+    for module in sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:args.top]:
+        print(f"{module['cumulative_ms']:10.1f} ms  {module['self_ms']:8.1f} ms self  {module['module']}")
+
+    print("\n## Slowest top-level packages (self time)")
+    for package, self_ms in top_level_packages(modules)[:args.top]:
+        print(f"{self_ms:10.1f} ms  {package}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"total_ms": total_ms, "modules": modules}, f, indent=2)
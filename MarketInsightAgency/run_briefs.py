@@ -0,0 +1,220 @@
+"""
+Headless batch runner for research briefs.
+
+Reads briefs from a JSONL queue, one per line:
+
+    {"id": "notion-2024q4", "brief": "Prepare a market brief for Notion in the EU SMB segment"}
+
+("message" is accepted instead of "brief"; without an "id" the line number is used), runs each one through the
+agency in a worker pool and writes the final answer to <output-dir>/<id>.md. Completed briefs are appended to a
+checkpoint file as they finish, so re-running the same command after a crash only runs the remaining ones.
+
+    python run_briefs.py briefs.jsonl
+    python run_briefs.py briefs.jsonl --workers 8 --mode thread --output-dir reports/briefs
+
+Process mode (the default) gives every worker its own agency, tool state and browser. Thread mode is lighter
+but the workers share process-wide tool state such as the web driver.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent / "reports" / "briefs"
+
+_worker = threading.local()
+
+
+def load_briefs(path: str) -> List[Dict[str, str]]:
+    """Reads the JSONL queue and returns briefs with a unique string id and the message to send."""
+    briefs = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            brief_id = str(record.get("id", line_number))
+            message = record.get("brief") or record.get("message")
+            if not message:
+                raise ValueError(f"Line {line_number} has no 'brief' or 'message'")
+            if brief_id in seen:
+                raise ValueError(f"Duplicate brief id '{brief_id}' on line {line_number}")
+            seen.add(brief_id)
+            briefs.append({"id": brief_id, "message": message})
+    return briefs
+
+
+def load_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Returns the last recorded result per brief id; a partially written last line is ignored."""
+    results = {}
+    if not path.exists():
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            results[record["id"]] = record
+    return results
+
+
+def append_checkpoint(path: Path, record: Dict[str, Any]) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def output_path(output_dir: Path, brief_id: str) -> Path:
+    return output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', brief_id)}.md"
+
+
+def _reset_conversations(agency) -> None:
+    # Start every brief on new OpenAI threads so briefs do not see each other's history
+    agency.main_thread.id = None
+    agency.main_thread._thread = None
+    for agent_name, threads in agency.agents_and_threads.items():
+        if agent_name == "main_thread":
+            continue
+        for thread in threads.values():
+            thread.id = None
+            thread._thread = None
+
+
+def _get_worker_agency(mode: str):
+    import agency as agency_module
+
+    if mode == "process":
+        # One agency per worker process
+        return agency_module.get_agency()
+    # Agencies are not thread-safe, so every worker thread builds its own
+    if getattr(_worker, "agency", None) is None:
+        _worker.agency = agency_module.build_agency()
+    return _worker.agency
+
+
+def run_brief(brief: Dict[str, str], output_dir: str, mode: str) -> Dict[str, Any]:
+    """Runs one brief through the agency, writes its report and returns the checkpoint record."""
+    start = time.perf_counter()
+    record = {"id": brief["id"], "worker": f"{os.getpid()}:{threading.get_ident()}"}
+    agency = None
+    try:
+        agency = _get_worker_agency(mode)
+        _reset_conversations(agency)
+        response = agency.get_completion(brief["message"])
+
+        path = output_path(Path(output_dir), brief["id"])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# Brief: {brief['id']}\n\n")
+            f.write(f"**Request:** {brief['message']}\n\n")
+            f.write(f"**Completed:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
+            f.write(str(response))
+
+        record.update({"status": "ok", "output": str(path)})
+    except Exception as e:
+        record.update({"status": "error", "error": f"{type(e).__name__}: {str(e)}"})
+    finally:
+        if agency is not None:
+            # Let other workers use the browser between briefs
+            import agency as agency_module
+
+            agency_module.release_agency(agency)
+
+    record["duration"] = time.perf_counter() - start
+    return record
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(records: Iterable[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    records = list(records)
+    durations = [record["duration"] for record in records if record["status"] == "ok"]
+    return {
+        "briefs": len(records),
+        "succeeded": len(durations),
+        "failed": len(records) - len(durations),
+        "wall_time": wall_time,
+        "briefs_per_hour": len(durations) / wall_time * 3600 if wall_time > 0 else 0.0,
+        "latency_p50": percentile(durations, 50),
+        "latency_p95": percentile(durations, 95),
+        "latency_mean": statistics.mean(durations) if durations else None,
+    }
+
+
+def run_queue(queue_path: str, output_dir: Path = DEFAULT_OUTPUT_DIR, workers: int = 4, mode: str = "process",
+              checkpoint_path: Optional[Path] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Runs every brief in the queue that is not yet completed in the checkpoint and returns the run summary."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = checkpoint_path or output_dir / "checkpoint.jsonl"
+
+    briefs = load_briefs(queue_path)
+    completed = {brief_id for brief_id, record in load_checkpoint(checkpoint_path).items() if record["status"] == "ok"}
+    remaining = [brief for brief in briefs if brief["id"] not in completed]
+    if limit is not None:
+        remaining = remaining[:limit]
+    print(f"{len(briefs)} briefs in queue, {len(completed)} already completed, running {len(remaining)} "
+          f"with {workers} {mode} workers")
+
+    executor_class = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+    records = []
+    start = time.perf_counter()
+    with executor_class(max_workers=workers) as executor:
+        futures = {executor.submit(run_brief, brief, str(output_dir), mode): brief for brief in remaining}
+        for future in as_completed(futures):
+            brief = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. a crashed process)
+                record = {"id": brief["id"], "status": "error", "error": f"{type(e).__name__}: {str(e)}", "duration": 0.0}
+            record["finished_at"] = datetime.now().isoformat(timespec="seconds")
+            append_checkpoint(checkpoint_path, record)
+            records.append(record)
+
+            status = "ok" if record["status"] == "ok" else f"FAILED ({record['error']})"
+            print(f"[{len(records)}/{len(remaining)}] {record['id']}: {status} in {record['duration']:.1f}s")
+
+    summary = summarize(records, time.perf_counter() - start)
+    summary["records"] = records
+    with open(output_dir / f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued research briefs through the agency.")
+    parser.add_argument("queue", help="JSONL file with one brief per line")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BRIEF_WORKERS", 4)))
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output-dir>/checkpoint.jsonl)")
+    parser.add_argument("--limit", type=int, help="Run at most this many remaining briefs")
+    args = parser.parse_args()
+
+    summary = run_queue(args.queue, args.output_dir, args.workers, args.mode, args.checkpoint, args.limit)
+
+    print("\n# Batch Summary")
+    print(f"Briefs run: {summary['briefs']} ({summary['succeeded']} succeeded, {summary['failed']} failed)")
+    print(f"Wall time: {_format_seconds(summary['wall_time'])}")
+    print(f"Throughput: {summary['briefs_per_hour']:.1f} briefs/hour")
+    print(f"Latency p50: {_format_seconds(summary['latency_p50'])}, p95: {_format_seconds(summary['latency_p95'])}")
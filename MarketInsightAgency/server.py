@@ -0,0 +1,337 @@
+"""
+Async HTTP API in front of the agency, streaming agent messages as Server-Sent Events.
+
+    python server.py                      # listens on AGENCY_SERVER_HOST:AGENCY_SERVER_PORT (0.0.0.0:8000)
+
+Endpoints:
+    POST   /sessions              -> {"session_id": ...}
+    DELETE /sessions/{session_id}
+    POST   /chat                  body {"message": ..., "session_id": ...}; streams events:
+                                  session, message (one per agent message / tool call / tool output), done, error
+    GET    /health
+    GET    /metrics               Prometheus text format (/metrics.json for JSON); empty unless METRICS_ENABLED
+
+Every session gets its own agency, so conversations and OpenAI threads are never shared between sessions.
+Sessions are created explicitly and evicted after AGENCY_SESSION_TTL seconds without use if never deleted.
+Agent runs execute in a bounded thread pool; each stream has a bounded queue, so a slow client pauses the
+agent run that feeds it instead of buffering its output in memory.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from shared_tools.metrics import registry
+
+# Default server settings, overridable through environment variables
+server_config = {
+    "host": os.getenv("AGENCY_SERVER_HOST", "0.0.0.0"),
+    "port": int(os.getenv("AGENCY_SERVER_PORT", 8000)),
+    "max_sessions": int(os.getenv("AGENCY_MAX_SESSIONS", 100)),
+    "session_ttl": float(os.getenv("AGENCY_SESSION_TTL", 1800)),
+    "max_concurrent_runs": int(os.getenv("AGENCY_MAX_CONCURRENT_RUNS", 8)),
+    "stream_queue_size": int(os.getenv("AGENCY_STREAM_QUEUE_SIZE", 32)),
+    "heartbeat_interval": float(os.getenv("AGENCY_HEARTBEAT_INTERVAL", 15)),
+    "keepalive_timeout": float(os.getenv("AGENCY_KEEPALIVE_TIMEOUT", 75)),
+}
+
+_END = object()
+
+
+class Session:
+    def __init__(self, session_id: str, agency):
+        self.id = session_id
+        self.agency = agency
+        # One conversation turn at a time per session; an agency thread can only have one active run
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionManager:
+    """
+    Creates one agency per session and evicts sessions that have been idle longer than the TTL.
+    agency_release, if given, is called with the agency of every session that is deleted or evicted.
+    """
+
+    def __init__(self, agency_factory: Callable[[], Any], executor: ThreadPoolExecutor,
+                 max_sessions: int, ttl: float, agency_release: Optional[Callable[[Any], None]] = None):
+        self.agency_factory = agency_factory
+        self.agency_release = agency_release
+        self.executor = executor
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.sessions: Dict[str, Session] = {}
+
+    async def create(self) -> Session:
+        self.evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            # Drop the least recently used idle session to make room
+            idle = [session for session in self.sessions.values() if not session.lock.locked()]
+            if not idle:
+                raise web.HTTPServiceUnavailable(text="Too many active sessions")
+            self._close(self.sessions.pop(min(idle, key=lambda session: session.last_used).id))
+
+        # Building an agency makes blocking OpenAI calls
+        agency = await asyncio.get_running_loop().run_in_executor(self.executor, self.agency_factory)
+        session = Session(uuid.uuid4().hex, agency)
+        self.sessions[session.id] = session
+        registry.inc("server_sessions_created_total")
+        return session
+
+    def get(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise web.HTTPNotFound(text=f"Unknown session '{session_id}'")
+        session.last_used = time.monotonic()
+        return session
+
+    def delete(self, session_id: str) -> None:
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self._close(session)
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        for session in list(self.sessions.values()):
+            if now - session.last_used > self.ttl and not session.lock.locked():
+                self._close(self.sessions.pop(session.id))
+
+    def _close(self, session: Session) -> None:
+        # Give the session's browser back to the pool right away instead of after BROWSER_IDLE_TIMEOUT
+        if self.agency_release is None:
+            return
+        try:
+            self.agency_release(session.agency)
+        except Exception as e:
+            print(f"Error releasing session {session.id}: {str(e)}")
+
+
+def _message_event(message) -> Dict[str, Any]:
+    return {
+        "type": message.msg_type,
+        "sender": message.sender_name,
+        "receiver": message.receiver_name,
+        "content": message.content,
+    }
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _run_completion(agency, message: str, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue,
+                    cancelled: threading.Event) -> None:
+    """Runs in a worker thread: feeds agent messages into the stream queue, blocking while it is full."""
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    try:
+        completion = agency.get_completion(message, yield_messages=True)
+        while not cancelled.is_set():
+            try:
+                put(("message", _message_event(next(completion))))
+            except StopIteration as stop:
+                put(("done", {"response": str(stop.value)}))
+                break
+        else:
+            completion.close()
+    except Exception as e:
+        put(("error", {"error": f"{type(e).__name__}: {str(e)}"}))
+    finally:
+        put(_END)
+
+
+def _cancel_active_runs(agency) -> None:
+    """Cancels the OpenAI runs still active on the agency's threads, so an abandoned turn stops promptly."""
+    threads = [agency.main_thread]
+    for agent_name, agent_threads in agency.agents_and_threads.items():
+        if agent_name != "main_thread":
+            threads.extend(agent_threads.values())
+    for thread in threads:
+        if not hasattr(thread, "cancel_run"):
+            continue
+        try:
+            thread.cancel_run()
+        except Exception as e:
+            print(f"Error cancelling run: {str(e)}")
+
+
+async def create_session(request: web.Request) -> web.Response:
+    session = await request.app["sessions"].create()
+    return web.json_response({"session_id": session.id})
+
+
+async def delete_session(request: web.Request) -> web.Response:
+    request.app["sessions"].delete(request.match_info["session_id"])
+    return web.json_response({"deleted": request.match_info["session_id"]})
+
+
+async def chat(request: web.Request) -> web.StreamResponse:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="Request body must be JSON")
+
+    message = body.get("message")
+    if not message and body.get("messages"):
+        # Chat-completions style payload: use the latest user message
+        message = next((m.get("content") for m in reversed(body["messages"]) if m.get("role") == "user"), None)
+    if not message:
+        raise web.HTTPBadRequest(text="'message' is required")
+
+    app = request.app
+    sessions = app["sessions"]
+    if not body.get("session_id"):
+        # A session per request would build (and abandon) a whole agency every time
+        raise web.HTTPBadRequest(text="'session_id' is required; create a session with POST /sessions")
+    session = sessions.get(body["session_id"])
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+    await response.write(_format_sse("session", {"session_id": session.id}))
+
+    start = time.perf_counter()
+    status = "ok"
+    first_event = None
+    cancelled = threading.Event()
+    ended = False
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=server_config["stream_queue_size"])
+
+    async with session.lock:
+        run = loop.run_in_executor(app["executor"], _run_completion, session.agency, message, loop, queue, cancelled)
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=server_config["heartbeat_interval"])
+                except asyncio.TimeoutError:
+                    # SSE comment so proxies and the client keep the connection open during long tool runs
+                    await response.write(b": keep-alive\n\n")
+                    continue
+                if item is _END:
+                    ended = True
+                    break
+
+                event, data = item
+                if first_event is None:
+                    first_event = time.perf_counter() - start
+                if event == "done":
+                    data["latency"] = time.perf_counter() - start
+                elif event == "error":
+                    status = "error"
+                await response.write(_format_sse(event, data))
+        except ConnectionResetError:
+            # The client went away; the finally block cancels the agent run
+            status = "disconnected"
+        except asyncio.CancelledError:
+            status = "disconnected"
+            raise
+        finally:
+            if not ended:
+                # The worker only sees the flag between messages; cancelling the OpenAI runs also ends a turn
+                # that is waiting on a long tool call. Drain the queue so the worker never blocks on it.
+                cancelled.set()
+                await asyncio.to_thread(_cancel_active_runs, session.agency)
+                while await queue.get() is not _END:
+                    pass
+            await run
+            session.last_used = time.monotonic()
+
+            registry.observe("server_request_seconds", time.perf_counter() - start, route="/chat", status=status)
+            if first_event is not None:
+                registry.observe("server_time_to_first_event_seconds", first_event, route="/chat")
+            registry.inc("server_requests_total", route="/chat", status=status)
+
+    if status != "disconnected":
+        await response.write_eof()
+    return response
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "sessions": len(request.app["sessions"].sessions)})
+
+
+async def metrics(request: web.Request) -> web.Response:
+    return web.Response(text=registry.to_prometheus(), content_type="text/plain")
+
+
+async def metrics_json(request: web.Request) -> web.Response:
+    return web.json_response(registry.to_dict())
+
+
+@web.middleware
+async def timing_middleware(request: web.Request, handler):
+    if request.path == "/chat":
+        # Streaming requests are timed in the handler, which knows when the stream ends
+        return await handler(request)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "unmatched"
+        registry.observe("server_request_seconds", time.perf_counter() - start, route=route, status=status)
+        registry.inc("server_requests_total", route=route, status=status)
+
+
+async def _evict_idle_sessions(app: web.Application):
+    async def loop():
+        while True:
+            await asyncio.sleep(60)
+            app["sessions"].evict_idle()
+
+    task = asyncio.create_task(loop())
+    yield
+    task.cancel()
+
+
+def create_app(agency_factory: Optional[Callable[[], Any]] = None,
+               agency_release: Optional[Callable[[Any], None]] = None) -> web.Application:
+    """
+    Builds the aiohttp application. agency_factory defaults to agency.build_agency, together with
+    agency.release_agency as agency_release, which is called with the agency of every session that ends.
+    """
+    if agency_factory is None:
+        from agency import build_agency, release_agency
+        agency_factory = build_agency
+        agency_release = agency_release or release_agency
+
+    app = web.Application(middlewares=[timing_middleware])
+    app["executor"] = ThreadPoolExecutor(max_workers=server_config["max_concurrent_runs"],
+                                         thread_name_prefix="agency-run")
+    app["sessions"] = SessionManager(agency_factory, app["executor"],
+                                     server_config["max_sessions"], server_config["session_ttl"], agency_release)
+    app.cleanup_ctx.append(_evict_idle_sessions)
+    app.on_cleanup.append(lambda app: asyncio.to_thread(app["executor"].shutdown, wait=False, cancel_futures=True))
+
+    app.router.add_post("/sessions", create_session)
+    app.router.add_delete("/sessions/{session_id}", delete_session)
+    app.router.add_post("/chat", chat)
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/metrics.json", metrics_json)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(
+        create_app(),
+        host=server_config["host"],
+        port=server_config["port"],
+        keepalive_timeout=server_config["keepalive_timeout"],
+    )
@@ -1,9 +1,11 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 from typing import Optional, Dict, Any, List
-import openai
 from datetime import datetime
 
+from .llm_gateway import get_llm_gateway
+from .response_cache import cache_config, get_response_cache, make_cache_key
+
 class AICentralDataSource(BaseTool):
     """
     Central AI data source that replaces all external APIs and databases.
@@ -30,6 +32,11 @@ class AICentralDataSource(BaseTool):
         description="Format of the output (structured, raw, metrics, analysis)"
     )
 
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse a previously generated response for an identical request. Set to False to force fresh data."
+    )
+
     def run(self) -> str:
         try:
             # Define data generation prompts for different types
@@ -106,19 +113,33 @@ class AICentralDataSource(BaseTool):
             if self.context:
                 messages.append({"role": "user", "content": f"Additional context: {self.context}"})
             
-            # Get AI response
-            response = openai.chat.completions.create(
-                model="gpt-4-1106-preview",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            # Format the response
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            result = response.choices[0].message.content
+            # Reuse a cached response for identical messages and generation settings
+            settings = {"model": "gpt-4-1106-preview", "temperature": 0.7, "max_tokens": 2000}
+            use_cache = self.use_cache and cache_config["enabled"]
+            cache_key = make_cache_key(messages, **settings)
+            result = get_response_cache().get(cache_key) if use_cache else None
+
+            if result is None:
+                # Get AI response
+                response = get_llm_gateway().chat_completion(
+                    messages=messages,
+                    **settings
+                )
+                result = response.choices[0].message.content
+
+                if use_cache:
+                    get_response_cache().set(cache_key, result)
+
+            # Format the response around the (possibly cached) payload so the timestamp stays current
+            return self._format_output(result)
             
-            formatted_output = f"""# AI-Generated {self.query_type.replace('_', ' ').title()} Report
+        except Exception as e:
+            return f"Error generating data: {str(e)}"
+
+    def _format_output(self, result: str) -> str:
+        """Wraps the generated data in the markdown report layout"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"""# AI-Generated {self.query_type.replace('_', ' ').title()} Report
 Generated: {timestamp}
 
 ## Query Parameters
@@ -130,10 +151,6 @@ Generated: {timestamp}
 ---
 *Generated by AI Central Data Source*
 """
-            return formatted_output
-            
-        except Exception as e:
-            return f"Error generating data: {str(e)}"
 
     def _format_dict(self, d: Dict[str, Any], indent: int = 0) -> str:
         """Helper method to format dictionary nicely in markdown"""
@@ -1,9 +1,10 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-from typing import Optional, Dict, Any, List
-import openai
+from typing import Optional, Dict, Any, List, Iterator, AsyncIterator
 from datetime import datetime
 
+from .llm_gateway import get_llm_gateway
+
 class AIDataAnalyzer(BaseTool):
     """
     A universal tool for replacing API calls with AI-powered analysis.
@@ -27,88 +28,134 @@ class AIDataAnalyzer(BaseTool):
 
     def run(self) -> str:
         try:
-            # Define prompts for different types of data analysis
-            prompts = {
-                "web_scraping": """Act as a web scraping tool. Based on the provided parameters, generate realistic website data for:
-                - Content structure
-                - Key information
-                - Relevant metrics
-                Format the response as if it was scraped from a real website.""",
-                
-                "sentiment_analysis": """Act as a sentiment analysis API. Analyze the text and provide:
-                - Sentiment scores (positive/negative/neutral)
-                - Key phrases
-                - Emotional indicators
-                - Confidence scores""",
-                
-                "market_data": """Act as a market data API. Generate realistic market data including:
-                - Market trends
-                - Competitor metrics
-                - Industry statistics
-                - Growth indicators""",
-                
-                "social_media_metrics": """Act as a social media analytics API. Generate realistic metrics for:
-                - Engagement rates
-                - Follower growth
-                - Content performance
-                - Audience demographics""",
-                
-                "competitor_data": """Act as a competitor analysis tool. Generate realistic competitive intelligence:
-                - Market positioning
-                - Product offerings
-                - Pricing strategies
-                - Recent developments""",
-                
-                "customer_feedback": """Act as a customer feedback analysis tool. Generate realistic customer insights:
-                - Satisfaction metrics
-                - Common complaints
-                - Positive feedback
-                - Improvement suggestions"""
-            }
-            
-            # Get the appropriate prompt
-            base_prompt = prompts.get(
-                self.query_type,
-                "Generate realistic data based on the provided parameters."
-            )
-            
-            # Construct the message
-            messages = [
-                {"role": "system", "content": base_prompt},
-                {"role": "user", "content": f"Parameters: {str(self.query_params)}"}
-            ]
-            
-            if self.context:
-                messages.append({"role": "user", "content": f"Additional context: {self.context}"})
-            
             # Get AI response
-            response = openai.chat.completions.create(
+            response = get_llm_gateway().chat_completion(
                 model="gpt-4-1106-preview",
-                messages=messages,
+                messages=self._build_messages(),
                 temperature=0.7,
                 max_tokens=2000
             )
             
             # Format the response as a structured report
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             result = response.choices[0].message.content
+            return self._format_header() + result + self._format_footer()
             
-            formatted_output = f"""# AI-Generated {self.query_type.replace('_', ' ').title()} Report
+        except Exception as e:
+            return f"Error in AI analysis: {str(e)}"
+
+    def stream(self, stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Streaming version of run(). Yields the report header immediately, then content deltas as the
+        model produces them, then the footer; the concatenated chunks equal the output of run().
+        Pass a dict as stats to receive time_to_first_token, total_time and chunks.
+        """
+        yield self._format_header()
+        try:
+            for delta in get_llm_gateway().stream_chat_completion(
+                stats=stats,
+                model="gpt-4-1106-preview",
+                messages=self._build_messages(),
+                temperature=0.7,
+                max_tokens=2000
+            ):
+                yield delta
+        except Exception as e:
+            yield f"Error in AI analysis: {str(e)}"
+            return
+        yield self._format_footer()
+
+    async def astream(self, stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Asynchronous version of stream()."""
+        yield self._format_header()
+        try:
+            async for delta in get_llm_gateway().astream_chat_completion(
+                stats=stats,
+                model="gpt-4-1106-preview",
+                messages=self._build_messages(),
+                temperature=0.7,
+                max_tokens=2000
+            ):
+                yield delta
+        except Exception as e:
+            yield f"Error in AI analysis: {str(e)}"
+            return
+        yield self._format_footer()
+
+    def _build_messages(self) -> List[Dict[str, Any]]:
+        """Builds the chat messages for the query type, parameters and context"""
+        # Define prompts for different types of data analysis
+        prompts = {
+            "web_scraping": """Act as a web scraping tool. Based on the provided parameters, generate realistic website data for:
+            - Content structure
+            - Key information
+            - Relevant metrics
+            Format the response as if it was scraped from a real website.""",
+            
+            "sentiment_analysis": """Act as a sentiment analysis API. Analyze the text and provide:
+            - Sentiment scores (positive/negative/neutral)
+            - Key phrases
+            - Emotional indicators
+            - Confidence scores""",
+            
+            "market_data": """Act as a market data API. Generate realistic market data including:
+            - Market trends
+            - Competitor metrics
+            - Industry statistics
+            - Growth indicators""",
+            
+            "social_media_metrics": """Act as a social media analytics API. Generate realistic metrics for:
+            - Engagement rates
+            - Follower growth
+            - Content performance
+            - Audience demographics""",
+            
+            "competitor_data": """Act as a competitor analysis tool. Generate realistic competitive intelligence:
+            - Market positioning
+            - Product offerings
+            - Pricing strategies
+            - Recent developments""",
+            
+            "customer_feedback": """Act as a customer feedback analysis tool. Generate realistic customer insights:
+            - Satisfaction metrics
+            - Common complaints
+            - Positive feedback
+            - Improvement suggestions"""
+        }
+        
+        # Get the appropriate prompt
+        base_prompt = prompts.get(
+            self.query_type,
+            "Generate realistic data based on the provided parameters."
+        )
+        
+        # Construct the message
+        messages = [
+            {"role": "system", "content": base_prompt},
+            {"role": "user", "content": f"Parameters: {str(self.query_params)}"}
+        ]
+        
+        if self.context:
+            messages.append({"role": "user", "content": f"Additional context: {self.context}"})
+
+        return messages
+
+    def _format_header(self) -> str:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"""# AI-Generated {self.query_type.replace('_', ' ').title()} Report
 Generated: {timestamp}
 
 ## Query Parameters
 {self._format_dict(self.query_params)}
 
 ## Analysis Results
-{result}
+"""
+
+    def _format_footer(self) -> str:
+        return """
 
 ---
 *Generated using AI analysis*
 """
-            return formatted_output
-            
-        except Exception as e:
-            return f"Error in AI analysis: {str(e)}"
 
     def _format_dict(self, d: Dict[str, Any], indent: int = 0) -> str:
         """Helper method to format dictionary nicely in markdown"""
@@ -1,37 +1,52 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Iterator, AsyncIterator, Union
+import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import openai
 from dotenv import load_dotenv
 
+from .llm_gateway import get_llm_gateway
+
+# Marker the model is asked to put in front of each answer when several inputs are packed into one prompt
+PACKED_ITEM_PATTERN = re.compile(r"^#{2,3}\s*ITEM\s+(\d+)\s*$", re.MULTILINE)
+
+# Completion limit of a single analysis
+MAX_TOKENS = 2000
+# Output tokens reserved for each item of a packed request, and the most a packed request may ask for;
+# packs are capped so their answers fit instead of truncating and falling back to one request per item
+PACK_ITEM_TOKENS = int(os.getenv("GPT_PACK_ITEM_TOKENS", 700))
+PACK_MAX_TOKENS = int(os.getenv("GPT_PACK_MAX_TOKENS", 4096))
+
 class GPTDataProcessor(BaseTool):
     """
     A tool for processing data using GPT models and generating insights.
     This tool can be used to analyze text, generate reports, and extract insights using LLM capabilities.
     """
-    
+
     input_text: str = Field(
         ...,
         description="The text input to be processed by the GPT model"
     )
-    
+
     task_type: str = Field(
         ...,
         description="Type of analysis to perform (e.g., 'market_analysis', 'sentiment_analysis', 'competitor_analysis')"
     )
-    
+
     model: str = Field(
         default="gpt-4-1106-preview",
         description="The GPT model to use for processing"
     )
-    
+
     additional_context: Optional[Dict[str, Any]] = Field(
         default=None,
         description="Additional context or parameters for the analysis"
     )
-    
+
     output_format: str = Field(
         default="markdown",
         description="Format of the output (markdown, json, text)"
@@ -39,73 +54,258 @@ class GPTDataProcessor(BaseTool):
 
     def run(self) -> str:
         try:
-            # Prepare the system message based on task type
-            system_messages = {
-                "market_analysis": """You are a market analysis expert. Analyze the provided data and generate insights about:
-                - Market trends
-                - Growth opportunities
-                - Potential challenges
-                - Strategic recommendations""",
-                
-                "sentiment_analysis": """You are a sentiment analysis expert. Analyze the provided text and determine:
-                - Overall sentiment (positive, negative, neutral)
-                - Key emotional indicators
-                - Sentiment trends
-                - Notable patterns""",
-                
-                "competitor_analysis": """You are a competitor analysis expert. Analyze the provided data and identify:
-                - Competitor strengths and weaknesses
-                - Market positioning
-                - Competitive advantages
-                - Strategic moves""",
-            }
-            
-            system_message = system_messages.get(
-                self.task_type,
-                "You are an AI expert. Analyze the provided data and generate comprehensive insights."
-            )
-            
-            # Prepare messages for GPT
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": self.input_text}
-            ]
-            
-            # Add additional context if provided
-            if self.additional_context:
-                context_message = "\n\nAdditional Context:\n"
-                for key, value in self.additional_context.items():
-                    context_message += f"- {key}: {value}\n"
-                messages.append({"role": "user", "content": context_message})
-            
-            # Get response from GPT
-            response = openai.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            analysis_result = response.choices[0].message.content
-            
-            # Format the output
-            if self.output_format == "markdown":
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                formatted_output = f"""# {self.task_type.replace('_', ' ').title()} Report
+            analysis_result = self._complete(self._build_messages())
+            return self._format_output(analysis_result)
+
+        except Exception as e:
+            return f"Error processing data with GPT: {str(e)}"
+
+    def _build_messages(self, system_suffix: str = "") -> List[Dict[str, Any]]:
+        """Builds the chat messages for the current input, task type and context"""
+        # Prepare the system message based on task type
+        system_messages = {
+            "market_analysis": """You are a market analysis expert. Analyze the provided data and generate insights about:
+            - Market trends
+            - Growth opportunities
+            - Potential challenges
+            - Strategic recommendations""",
+
+            "sentiment_analysis": """You are a sentiment analysis expert. Analyze the provided text and determine:
+            - Overall sentiment (positive, negative, neutral)
+            - Key emotional indicators
+            - Sentiment trends
+            - Notable patterns""",
+
+            "competitor_analysis": """You are a competitor analysis expert. Analyze the provided data and identify:
+            - Competitor strengths and weaknesses
+            - Market positioning
+            - Competitive advantages
+            - Strategic moves""",
+        }
+
+        system_message = system_messages.get(
+            self.task_type,
+            "You are an AI expert. Analyze the provided data and generate comprehensive insights."
+        )
+
+        # Prepare messages for GPT
+        messages = [
+            {"role": "system", "content": system_message + system_suffix},
+            {"role": "user", "content": self.input_text}
+        ]
+
+        # Add additional context if provided
+        if self.additional_context:
+            context_message = "\n\nAdditional Context:\n"
+            for key, value in self.additional_context.items():
+                context_message += f"- {key}: {value}\n"
+            messages.append({"role": "user", "content": context_message})
+
+        return messages
+
+    def _complete(self, messages: List[Dict[str, Any]], priority: str = "interactive",
+                  max_tokens: int = MAX_TOKENS) -> str:
+        """Sends the messages to the model and returns the raw completion text"""
+        response = get_llm_gateway().chat_completion(
+            priority=priority,
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+    def _format_header(self) -> str:
+        if self.output_format != "markdown":
+            return ""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"""# {self.task_type.replace('_', ' ').title()} Report
 Generated: {timestamp}
 
-{analysis_result}
+"""
+
+    def _format_footer(self) -> str:
+        if self.output_format != "markdown":
+            return ""
+        return f"""
 
 ---
 *Generated using {self.model}*
 """
-            else:
-                formatted_output = analysis_result
-            
-            return formatted_output
-            
+
+    def _format_output(self, analysis_result: str) -> str:
+        """Wraps the completion in the requested output format"""
+        return self._format_header() + analysis_result + self._format_footer()
+
+    def stream(self, stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Streaming version of run(). Yields the markdown header immediately, then content deltas as the
+        model produces them, then the footer; the concatenated chunks equal the output of run().
+        Pass a dict as stats to receive time_to_first_token, total_time and chunks.
+        """
+        yield self._format_header()
+        try:
+            for delta in get_llm_gateway().stream_chat_completion(
+                stats=stats,
+                model=self.model,
+                messages=self._build_messages(),
+                temperature=0.7,
+                max_tokens=MAX_TOKENS
+            ):
+                yield delta
         except Exception as e:
-            return f"Error processing data with GPT: {str(e)}"
+            yield f"Error processing data with GPT: {str(e)}"
+            return
+        yield self._format_footer()
+
+    async def astream(self, stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Asynchronous version of stream()."""
+        yield self._format_header()
+        try:
+            async for delta in get_llm_gateway().astream_chat_completion(
+                stats=stats,
+                model=self.model,
+                messages=self._build_messages(),
+                temperature=0.7,
+                max_tokens=MAX_TOKENS
+            ):
+                yield delta
+        except Exception as e:
+            yield f"Error processing data with GPT: {str(e)}"
+            return
+        yield self._format_footer()
+
+    @classmethod
+    def run_batch(
+        cls,
+        inputs: Union[str, Iterable[Any]],
+        task_type: str,
+        max_parallel: int = 8,
+        pack: bool = False,
+        pack_max_chars: int = 1500,
+        pack_size: int = 8,
+        **tool_kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Processes many inputs with the same task_type concurrently.
+
+        :param inputs: A list or iterator of input texts, or the path to a JSONL file whose lines are
+            either JSON strings or objects with an "input_text" key.
+        :param task_type: Type of analysis applied to every input.
+        :param max_parallel: Maximum number of requests in flight at once.
+        :param pack: If True, consecutive inputs shorter than pack_max_chars are grouped (up to pack_size
+            per prompt, and no more than fit PACK_MAX_TOKENS of output) into a single request and the answer
+            is split back per input.
+        :param tool_kwargs: Other tool fields (model, additional_context, output_format) shared by all items.
+        :return: One result per input, in input order, with the keys index, input_text, output, error,
+            latency (seconds) and packed.
+        """
+        texts = _load_batch_inputs(inputs)
+        results = [None] * len(texts)
+        pack_size = max(1, min(pack_size, PACK_MAX_TOKENS // PACK_ITEM_TOKENS))
+
+        # Group the inputs into jobs; each job is a list of indexes sent in one request
+        jobs = []
+        group = []
+        for index, text in enumerate(texts):
+            if pack and len(text) <= pack_max_chars:
+                group.append(index)
+                if len(group) == pack_size:
+                    jobs.append(group)
+                    group = []
+            else:
+                jobs.append([index])
+        if group:
+            jobs.append(group)
+
+        def run_single(index: int) -> Dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                tool = cls(input_text=texts[index], task_type=task_type, **tool_kwargs)
+                output = tool._format_output(tool._complete(tool._build_messages(), priority="batch"))
+                error = None
+            except Exception as e:
+                output, error = None, str(e)
+            return {
+                "index": index,
+                "input_text": texts[index],
+                "output": output,
+                "error": error,
+                "latency": time.perf_counter() - start,
+                "packed": False,
+            }
+
+        def run_job(indexes: List[int]) -> List[Dict[str, Any]]:
+            if len(indexes) == 1:
+                return [run_single(indexes[0])]
+
+            start = time.perf_counter()
+            try:
+                answers = cls._complete_packed([texts[i] for i in indexes], task_type, **tool_kwargs)
+            except Exception:
+                answers = None
+
+            # Fall back to one request per input if the packed answer could not be split
+            if answers is None:
+                return [run_single(index) for index in indexes]
+
+            latency = time.perf_counter() - start
+            return [
+                {
+                    "index": index,
+                    "input_text": texts[index],
+                    "output": answer,
+                    "error": None,
+                    "latency": latency,
+                    "packed": True,
+                }
+                for index, answer in zip(indexes, answers)
+            ]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+            for job_results in executor.map(run_job, jobs):
+                for result in job_results:
+                    results[result["index"]] = result
+
+        return results
+
+    @classmethod
+    def _complete_packed(cls, texts: List[str], task_type: str, **tool_kwargs) -> Optional[List[str]]:
+        """Answers several inputs with one request; returns None if the answer does not split cleanly"""
+        packed_input = "\n\n".join(f"### ITEM {n}\n{text}" for n, text in enumerate(texts, 1))
+        tool = cls(input_text=packed_input, task_type=task_type, **tool_kwargs)
+        suffix = (
+            f"\n\nThe user message contains {len(texts)} independent items, each starting with a line "
+            f"'### ITEM <n>'. Analyze every item separately and start each analysis with the same "
+            f"'### ITEM <n>' line, in order, with nothing before the first marker. Keep each analysis "
+            f"under {PACK_ITEM_TOKENS * 3 // 4} words."
+        )
+        max_tokens = min(PACK_ITEM_TOKENS * len(texts), PACK_MAX_TOKENS)
+        answer = tool._complete(tool._build_messages(system_suffix=suffix), priority="batch", max_tokens=max_tokens)
+
+        parts = PACKED_ITEM_PATTERN.split(answer)
+        # split() yields [preamble, n1, body1, n2, body2, ...]
+        numbers = [int(n) for n in parts[1::2]]
+        if numbers != list(range(1, len(texts) + 1)):
+            return None
+
+        return [tool._format_output(body.strip()) for body in parts[2::2]]
+
+
+def _load_batch_inputs(inputs: Union[str, Iterable[Any]]) -> List[str]:
+    """Normalizes batch inputs given as a JSONL path or an iterable of strings/dicts"""
+    if isinstance(inputs, str):
+        if not os.path.isfile(inputs):
+            raise ValueError(f"Batch input file not found: {inputs}")
+        with open(inputs, "r", encoding="utf-8") as f:
+            inputs = [json.loads(line) for line in f if line.strip()]
+
+    texts = []
+    for item in inputs:
+        if isinstance(item, dict):
+            item = item["input_text"]
+        texts.append(str(item))
+    return texts
 
 if __name__ == "__main__":
     # Test the tool
@@ -114,7 +314,7 @@ if __name__ == "__main__":
     Their social media engagement has increased by 45% in the last quarter.
     Customer feedback indicates high satisfaction but concerns about pricing.
     """
-    
+
     tool = GPTDataProcessor(
         input_text=test_input,
         task_type="market_analysis",
@@ -124,4 +324,4 @@ if __name__ == "__main__":
             "time_period": "Q3 2023"
         }
     )
-    print(tool.run()) 
\ No newline at end of file
+    print(tool.run())
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .response_cache import make_cache_key
+
+# Cassette settings, overridable through environment variables.
+# mode: "off", "record" (call the API and save every exchange) or "replay" (serve saved exchanges only).
+# latency: "recorded" to replay the latency measured while recording, or a fixed number of seconds.
+cassette_config = {
+    "mode": os.getenv("LLM_CASSETTE_MODE", "off").lower(),
+    "directory": os.getenv("LLM_CASSETTE_DIR", "./cassettes"),
+    "latency": os.getenv("LLM_CASSETTE_LATENCY", "0"),
+}
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when no recording exists for a request."""
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    """Cassette key for chat completion kwargs; streamed and non-streamed calls share a recording."""
+    messages = kwargs.get("messages", [])
+    settings = {key: value for key, value in kwargs.items() if key not in ("messages", "stream", "stream_options")}
+    return make_cache_key(messages, **settings)
+
+
+class Cassette:
+    """
+    Stores chat completion request/response pairs as JSON files under directory/<key[:2]>/<key>.json
+    and replays them deterministically, optionally with simulated latency.
+    """
+
+    def __init__(self, directory: str, mode: str = "replay", latency: str = "0"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'. Expected 'record' or 'replay'.")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, key: str, record: Dict[str, Any]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial recording
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+        self.recorded += 1
+
+    def _replay_record(self, key: str, kind: str) -> Dict[str, Any]:
+        record = self.load(key)
+        if record is None:
+            self.misses += 1
+            raise CassetteMissError(f"No cassette recording for {kind} request {key} in {self.directory}")
+        self.hits += 1
+        return record
+
+    def simulated_latency(self, record: Dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            return float(record.get("latency", 0.0))
+        try:
+            return float(self.latency)
+        except ValueError:
+            return 0.0
+
+    def chat_completion(self, create: Callable[[], Any], kwargs: Dict[str, Any]):
+        """Replays or records a non-streamed chat completion produced by create()."""
+        from openai.types.chat import ChatCompletion
+
+        key = request_key(kwargs)
+        if self.mode == "replay":
+            record = self._replay_record(key, "chat completion")
+            time.sleep(self.simulated_latency(record))
+            return ChatCompletion.model_validate(record["response"])
+
+        start = time.perf_counter()
+        response = create()
+        self.save(key, {
+            "request": kwargs,
+            "response": response.model_dump(),
+            "latency": time.perf_counter() - start,
+        })
+        return response
+
+    def stream_chat_completion(self, create: Callable[[], Any], kwargs: Dict[str, Any]) -> Iterator[Any]:
+        """Replays or records a streamed chat completion; recordings are stored as full completions."""
+        from openai.types.chat import ChatCompletionChunk
+
+        key = request_key(kwargs)
+        if self.mode == "replay":
+            record = self._replay_record(key, "streamed chat completion")
+            return self.replay_stream(record, ChatCompletionChunk)
+        return self._record_stream(key, kwargs, create())
+
+    def replay_stream(self, record: Dict[str, Any], chunk_type) -> Iterator[Any]:
+        response = record["response"]
+        content = response["choices"][0]["message"].get("content") or ""
+        # Replay word-sized deltas, spending the simulated latency evenly across them
+        words = content.split(" ")
+        pieces = [word + " " for word in words[:-1]] + [words[-1]]
+        delay = self.simulated_latency(record) / max(1, len(pieces))
+        for piece in pieces:
+            time.sleep(delay)
+            yield chunk_type.model_validate({
+                "id": response.get("id", "replay"),
+                "object": "chat.completion.chunk",
+                "created": response.get("created", 0),
+                "model": response.get("model", ""),
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}],
+            })
+
+    def _record_stream(self, key: str, kwargs: Dict[str, Any], stream) -> Iterator[Any]:
+        start = time.perf_counter()
+        parts = []
+        last_chunk = None
+        for chunk in stream:
+            last_chunk = chunk
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+
+        self.save(key, {
+            "request": kwargs,
+            "response": {
+                "id": getattr(last_chunk, "id", "stream"),
+                "object": "chat.completion",
+                "created": getattr(last_chunk, "created", int(time.time())),
+                "model": getattr(last_chunk, "model", kwargs.get("model", "")),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(parts)},
+                    "finish_reason": "stop",
+                }],
+            },
+            "latency": time.perf_counter() - start,
+        })
+
+    def upload_file(self, create: Callable[[], Any], content: bytes, purpose: str) -> str:
+        """Replays or records a Files API upload; returns the file id."""
+        key = hashlib.sha256(purpose.encode("utf-8") + b"\0" + content).hexdigest()
+        if self.mode == "replay":
+            record = self._replay_record(key, "file upload")
+            time.sleep(self.simulated_latency(record))
+            return record["response"]["id"]
+
+        start = time.perf_counter()
+        file_id = create().id
+        self.save(key, {
+            "request": {"purpose": purpose, "bytes": len(content)},
+            "response": {"id": file_id},
+            "latency": time.perf_counter() - start,
+        })
+        return file_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Returns the process-wide cassette, or None when record/replay is off."""
+    global _cassette
+    if cassette_config["mode"] in ("", "off"):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(
+                cassette_config["directory"],
+                mode=cassette_config["mode"],
+                latency=cassette_config["latency"],
+            )
+        return _cassette
+
+
+def set_cassette_config(config: Dict[str, Any]) -> None:
+    global cassette_config, _cassette
+    with _cassette_lock:
+        cassette_config = {**cassette_config, **config}
+        _cassette = None
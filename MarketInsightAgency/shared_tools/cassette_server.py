@@ -0,0 +1,106 @@
+"""
+Minimal local stand-in for the OpenAI chat completions endpoint, serving responses from a cassette
+directory recorded with LLM_CASSETTE_MODE=record. Point a client at it to replay the calls routed through
+the LLM gateway (chat completions and file uploads) without the network:
+
+    python -m shared_tools.cassette_server --port 8765 --dir ./cassettes
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+
+Only those calls are served. agency_swarm talks to the Assistants API (/assistants, /threads, runs)
+directly; that traffic is neither recorded nor replayed, so running the agency itself still needs the network.
+"""
+import argparse
+import hashlib
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cassette import Cassette, request_key
+
+
+class CassetteRequestHandler(BaseHTTPRequestHandler):
+    cassette: Cassette = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        body = self._read_body()
+
+        if path.endswith("/chat/completions"):
+            self._chat_completions(json.loads(body or b"{}"))
+        elif path.endswith("/files"):
+            # Uploads are not recorded here; hand back a deterministic id derived from the payload
+            file_id = "file-" + hashlib.sha256(body).hexdigest()[:24]
+            self._send_json(200, {"id": file_id, "object": "file", "bytes": len(body),
+                                  "created_at": int(time.time()), "filename": "upload", "purpose": "assistants",
+                                  "status": "processed"})
+        else:
+            self._send_json(404, {"error": {"message": f"Unsupported endpoint {self.path}; only gateway chat completions "
+                                             f"and file uploads are replayed", "type": "invalid_request_error"}})
+
+    def _chat_completions(self, request):
+        record = self.cassette.load(request_key(request))
+        if record is None:
+            self.cassette.misses += 1
+            self._send_json(404, {"error": {"message": "No cassette recording for this request", "type": "cassette_miss"}})
+            return
+        self.cassette.hits += 1
+
+        if not request.get("stream"):
+            time.sleep(self.cassette.simulated_latency(record))
+            self._send_json(200, record["response"])
+            return
+
+        # Server-sent events in the same shape as the real streaming endpoint
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk in self.cassette.replay_stream(record, _PlainChunk):
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class _PlainChunk:
+    """Stands in for ChatCompletionChunk so replayed chunks stay plain JSON-serializable dicts."""
+
+    @staticmethod
+    def model_validate(data):
+        return data
+
+
+def serve(directory: str, host: str = "127.0.0.1", port: int = 8765, latency: str = "0") -> ThreadingHTTPServer:
+    handler = type("Handler", (CassetteRequestHandler,), {"cassette": Cassette(directory, mode="replay", latency=latency)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded chat completions from a cassette directory.")
+    parser.add_argument("--dir", default="./cassettes", help="Cassette directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="0", help="'recorded' or a fixed number of seconds per response")
+    args = parser.parse_args()
+
+    server = serve(args.dir, args.host, args.port, args.latency)
+    print(f"Serving cassettes from {args.dir} on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,277 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from .http_client import get_http_client
+from .metrics import registry
+from .urls import canonicalize_url
+
+# Default crawl settings, overridable through environment variables
+crawler_config = {
+    # Pages fetched at once across all hosts, and per host
+    "concurrency": int(os.getenv("CRAWL_CONCURRENCY", 10)),
+    "per_host_concurrency": int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", 2)),
+    # Minimum seconds between request starts to the same host; a larger robots.txt Crawl-delay wins
+    "per_host_delay": float(os.getenv("CRAWL_PER_HOST_DELAY", 1.0)),
+    "max_pages": int(os.getenv("CRAWL_MAX_PAGES", 100)),
+    # Link hops followed from the seed URLs; 0 fetches only the seeds
+    "max_depth": int(os.getenv("CRAWL_MAX_DEPTH", 0)),
+    "timeout": float(os.getenv("CRAWL_TIMEOUT", 20)),
+    "respect_robots": os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() not in ("0", "false", "no"),
+    "robots_ttl": float(os.getenv("CRAWL_ROBOTS_TTL", 60 * 60)),
+    "user_agent": os.getenv("CRAWL_USER_AGENT", "MarketInsightAgency-Crawler/1.0"),
+}
+
+# host -> (parser or None when robots.txt is unavailable, fetched_at); shared by all crawls in the process
+_robots = {}
+_robots_lock = threading.Lock()
+# host -> lock held while its robots.txt is fetched, so concurrent first requests fetch it once
+_robots_fetch_locks = {}
+
+
+def _fetch_robots(scheme: str, host: str) -> Optional[RobotFileParser]:
+    parser = RobotFileParser()
+    try:
+        response = get_http_client().get(f"{scheme}://{host}/robots.txt", timeout=crawler_config["timeout"],
+                                         headers={"User-Agent": crawler_config["user_agent"]})
+    except Exception:
+        return None
+    if response.status_code in (401, 403):
+        # Same interpretation as urllib.robotparser: access to the whole site is restricted
+        parser.disallow_all = True
+    elif response.status_code >= 400:
+        parser.allow_all = True
+    else:
+        parser.parse(response.text.splitlines())
+    return parser
+
+
+def get_robots(url: str) -> Optional[RobotFileParser]:
+    """Parsed robots.txt for the URL's host, cached for robots_ttl seconds. Blocking; call from a worker thread."""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    with _robots_lock:
+        fetch_lock = _robots_fetch_locks.setdefault(host, threading.Lock())
+
+    with fetch_lock:
+        with _robots_lock:
+            cached = _robots.get(host)
+        if cached and time.time() - cached[1] < crawler_config["robots_ttl"]:
+            return cached[0]
+
+        parser = _fetch_robots(parts.scheme, host)
+        with _robots_lock:
+            _robots[host] = (parser, time.time())
+        return parser
+
+
+def same_site_links(url: str, soup) -> Iterable[str]:
+    """Default link follower: every http(s) link on the page that points to the same host."""
+    host = urlsplit(url).hostname
+    for anchor in soup.find_all("a", href=True):
+        link = urljoin(url, anchor["href"])
+        if urlsplit(link).scheme in ("http", "https") and urlsplit(link).hostname == host:
+            yield link
+
+
+class _Host:
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+        self.delay = crawler_config["per_host_delay"]
+        self.robots_checked = False
+        self.stats = {"requests": 0, "errors": 0, "robots_blocked": 0, "wait_seconds": 0.0}
+
+
+class Crawler:
+    """
+    Polite asyncio crawler. Pages are fetched through the shared HTTP client in worker threads, with at most
+    per_host_concurrency requests per host in flight, request starts to a host spaced by per_host_delay (or the
+    host's robots.txt Crawl-delay) and URLs disallowed by robots.txt skipped. The frontier deduplicates URLs by
+    their canonical form and stops at max_depth link hops and max_pages pages.
+
+    extract(url, soup) is called for every HTML page and its return value stored as the page's data;
+    follow(url, soup) returns the links to crawl next (same-host links by default).
+    """
+
+    def __init__(
+        self,
+        extract: Callable[[str, Any], Any],
+        follow: Optional[Callable[[str, Any], Iterable[str]]] = None,
+        max_pages: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        per_host_delay: Optional[float] = None,
+    ):
+        self.extract = extract
+        self.follow = follow or same_site_links
+        self.max_pages = max_pages or crawler_config["max_pages"]
+        self.max_depth = crawler_config["max_depth"] if max_depth is None else max_depth
+        self.concurrency = concurrency or crawler_config["concurrency"]
+        self.per_host_concurrency = per_host_concurrency or crawler_config["per_host_concurrency"]
+        self.per_host_delay = crawler_config["per_host_delay"] if per_host_delay is None else per_host_delay
+        self._hosts: Dict[str, _Host] = {}
+
+    async def crawl(self, seeds: List[str]) -> Dict[str, Any]:
+        """
+        Crawls from the seed URLs and returns {"pages": [...], "stats": {...}}. Each page has url, depth,
+        status, data, error and fetch_time; stats has pages, seconds, pages_per_second and per-host
+        requests, errors, robots_blocked and wait_seconds (time spent waiting for the host's politeness limits).
+        """
+        start = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue()
+        seen = set()
+        pages = []
+
+        def enqueue(url: str, depth: int):
+            key = canonicalize_url(url)
+            if key in seen or len(seen) >= self.max_pages:
+                return
+            seen.add(key)
+            queue.put_nowait((url, depth))
+
+        for seed in seeds:
+            enqueue(seed, 0)
+
+        async def worker():
+            while True:
+                url, depth = await queue.get()
+                try:
+                    page = await self._crawl_page(url, depth)
+                    pages.append(page)
+                    for link in page.pop("links", []):
+                        enqueue(link, depth + 1)
+                except Exception as e:
+                    pages.append({"url": url, "depth": depth, "status": None, "data": None,
+                                  "error": str(e), "fetch_time": 0.0})
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        seconds = time.perf_counter() - start
+        fetched = sum(1 for page in pages if page["status"] is not None)
+        registry.observe("crawl_seconds", seconds)
+        registry.inc("crawl_pages_total", fetched)
+        return {
+            "pages": pages,
+            "stats": {
+                "pages": fetched,
+                "seconds": seconds,
+                "pages_per_second": fetched / seconds if seconds else 0.0,
+                "hosts": {host: state.stats for host, state in self._hosts.items()},
+            },
+        }
+
+    async def _crawl_page(self, url: str, depth: int) -> Dict[str, Any]:
+        host_name = urlsplit(url).netloc.lower()
+        host = self._hosts.get(host_name)
+        if host is None:
+            host = self._hosts[host_name] = _Host(self.per_host_concurrency)
+            host.delay = self.per_host_delay
+
+        if crawler_config["respect_robots"]:
+            robots = await asyncio.to_thread(get_robots, url)
+            if robots is not None:
+                if not host.robots_checked:
+                    host.delay = max(host.delay, robots.crawl_delay(crawler_config["user_agent"]) or 0)
+                    host.robots_checked = True
+                if not robots.can_fetch(crawler_config["user_agent"], url):
+                    host.stats["robots_blocked"] += 1
+                    return {"url": url, "depth": depth, "status": None, "data": None,
+                            "error": "Disallowed by robots.txt", "fetch_time": 0.0}
+
+        page = {"url": url, "depth": depth, "status": None, "data": None, "error": None, "links": []}
+        async with host.semaphore:
+            waited = time.perf_counter()
+            async with host.lock:
+                loop_time = asyncio.get_running_loop().time()
+                if host.next_start > loop_time:
+                    await asyncio.sleep(host.next_start - loop_time)
+                host.next_start = asyncio.get_running_loop().time() + host.delay
+            waited = time.perf_counter() - waited
+            host.stats["wait_seconds"] += waited
+            registry.observe("crawl_host_wait_seconds", waited, host=host_name)
+
+            fetch_start = time.perf_counter()
+            try:
+                response = await asyncio.to_thread(
+                    get_http_client().get, url, timeout=crawler_config["timeout"],
+                    headers={"User-Agent": crawler_config["user_agent"]},
+                )
+                page["status"] = response.status_code
+                response.raise_for_status()
+            except Exception as e:
+                page["error"] = str(e)
+                host.stats["errors"] += 1
+            host.stats["requests"] += 1
+            page["fetch_time"] = time.perf_counter() - fetch_start
+
+        if page["error"] is None and "html" in response.headers.get("Content-Type", "html").lower():
+            try:
+                page["data"], page["links"] = await asyncio.to_thread(
+                    self._process, url, response.text, depth < self.max_depth
+                )
+            except Exception as e:
+                page["error"] = f"Extraction failed: {e}"
+        return page
+
+    def _process(self, url: str, html: str, follow_links: bool):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        links = list(self.follow(url, soup)) if follow_links else []
+        return self.extract(url, soup), links
+
+
+def crawl(seeds: List[str], extract: Callable[[str, Any], Any], **options) -> Dict[str, Any]:
+    """
+    Runs a Crawler to completion from synchronous code (e.g. a tool's run()) and returns its result.
+    options are passed to Crawler. Works whether or not the calling thread already runs an event loop.
+    """
+    crawler = Crawler(extract, **options)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(crawler.crawl(seeds))
+
+    # Called from inside an event loop: run the crawl on its own loop in a separate thread
+    result = {}
+
+    def run():
+        try:
+            result["value"] = asyncio.run(crawler.crawl(seeds))
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, name="crawler")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def format_crawl_stats(stats: Dict[str, Any]) -> str:
+    """One-line summary of a crawl: pages, pages per second and per-host politeness wait."""
+    hosts = ", ".join(f"{host} {host_stats['requests']} requests, {host_stats['wait_seconds']:.1f}s waiting"
+                      for host, host_stats in stats["hosts"].items())
+    return (f"Crawled {stats['pages']} pages in {stats['seconds']:.1f}s "
+            f"({stats['pages_per_second']:.2f} pages/s). {hosts}")
+
+
+def set_crawler_config(config: Dict[str, Any]) -> None:
+    global crawler_config
+    crawler_config = {**crawler_config, **config}
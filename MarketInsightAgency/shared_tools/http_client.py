@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+from .metrics import record_http_call
+
+# Default HTTP settings, overridable through environment variables
+http_config = {
+    "connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+    "read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+    # Retries of idempotent requests after connection errors, read errors and retryable status codes
+    "retries": int(os.getenv("HTTP_RETRIES", 3)),
+    # Sleep between retries is backoff_factor * 2 ** (retry - 1) seconds, or the server's Retry-After
+    "backoff_factor": float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5)),
+    "retry_statuses": (429, 500, 502, 503, 504),
+    # Number of hosts with a pool of kept-alive connections, and connections kept per host
+    "pool_connections": int(os.getenv("HTTP_POOL_CONNECTIONS", 20)),
+    "pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", 10)),
+    "user_agent": os.getenv("HTTP_USER_AGENT", "MarketInsightAgency/1.0 (+python-requests)"),
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class HTTPClient(requests.Session):
+    """
+    requests.Session with the configured connect/read timeouts applied to every request that does not set its own,
+    and each request's latency and status recorded per host. Retries, pooling and keep-alive come from the adapter.
+    The client is shared by every tool and server session, so it never stores cookies; pass cookies per request.
+    """
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (http_config["connect_timeout"], http_config["read_timeout"]))
+        host = urlsplit(url).hostname or "unknown"
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+        except Exception:
+            record_http_call(host, time.perf_counter() - start)
+            raise
+        record_http_call(host, time.perf_counter() - start, response.status_code)
+        return response
+
+
+def create_http_client() -> HTTPClient:
+    retry = Retry(
+        total=http_config["retries"],
+        backoff_factor=http_config["backoff_factor"],
+        status_forcelist=http_config["retry_statuses"],
+        # Only idempotent methods (GET, HEAD, PUT, DELETE, OPTIONS, TRACE) are retried
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        # Return the last response instead of raising, so callers see the status via raise_for_status()
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=http_config["pool_connections"],
+        pool_maxsize=http_config["pool_maxsize"],
+    )
+
+    client = HTTPClient()
+    # An empty allow-list rejects every cookie, so one session's cookies never reach another's requests
+    client.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    client.mount("http://", adapter)
+    client.mount("https://", adapter)
+    client.headers.update({
+        "User-Agent": http_config["user_agent"],
+        # gzip and deflate, plus br when brotli is installed; urllib3 decodes whatever it advertises
+        "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    })
+    return client
+
+
+def get_http_client() -> HTTPClient:
+    """Returns the process-wide HTTP client shared by all network tools."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_http_client()
+        return _client
+
+
+def set_http_config(config: Dict[str, Any]) -> None:
+    global http_config, _client
+    http_config = {**http_config, **config}
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
@@ -0,0 +1,348 @@
+import asyncio
+import contextvars
+import itertools
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from .cassette import get_cassette
+from .metrics import record_http_call, record_llm_usage
+from .response_cache import make_cache_key
+from .single_flight import SingleFlight
+from .tokens import count_message_tokens
+
+# Default gateway settings, overridable through environment variables
+gateway_config = {
+    "max_workers": int(os.getenv("LLM_MAX_WORKERS", 8)),
+    "requests_per_minute": int(os.getenv("LLM_REQUESTS_PER_MINUTE", 500)),
+    "tokens_per_minute": int(os.getenv("LLM_TOKENS_PER_MINUTE", 150000)),
+    "max_retries": int(os.getenv("LLM_MAX_RETRIES", 5)),
+    "backoff_base": float(os.getenv("LLM_BACKOFF_BASE", 1.0)),
+    "backoff_max": float(os.getenv("LLM_BACKOFF_MAX", 60.0)),
+}
+
+# Lower values are scheduled first
+PRIORITIES = {
+    "interactive": 0,
+    "batch": 10,
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at capacity-per-minute.
+    """
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """Blocks until amount is available and returns the time spent waiting."""
+        if self.capacity <= 0:
+            return 0.0
+
+        # Requests larger than the whole bucket would otherwise never be admitted
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class LLMGateway:
+    """
+    Single entry point for chat completions shared by every tool in the agency.
+    Requests are queued by priority, executed by a bounded worker pool, admitted through
+    requests-per-minute and tokens-per-minute buckets and retried with jittered backoff.
+    Identical requests that are in flight at the same time share a single upstream call.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 150000,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self.single_flight = SingleFlight()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers = []
+        self._workers_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "errors": 0,
+            "throttle_wait": 0.0,
+        }
+
+    def _get_client(self):
+        from agency_swarm import get_openai_client
+        return get_openai_client()
+
+    def _ensure_workers(self):
+        with self._workers_lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, name=f"llm-gateway-{len(self._workers)}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _worker(self):
+        while True:
+            _, _, future, context, call, kwargs = self._queue.get()
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    # Run in the submitter's context so usage is attributed to the calling tool
+                    future.set_result(context.run(self._call_with_retry, call, kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _record(self, key: str, value: float = 1):
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def _call_with_retry(self, call, kwargs: Dict[str, Any]):
+        estimated_tokens = 0
+        if "messages" in kwargs:
+            model = kwargs.get("model", "gpt-4")
+            estimated_tokens = count_message_tokens(kwargs["messages"], model) + kwargs.get("max_tokens", 1000)
+
+        attempt = 0
+        while True:
+            waited = self.request_bucket.acquire(1)
+            waited += self.token_bucket.acquire(estimated_tokens)
+            self._record("throttle_wait", waited)
+            self._record("requests")
+
+            start = time.perf_counter()
+            try:
+                result = call(**kwargs)
+            except Exception as e:
+                record_http_call("api.openai.com", time.perf_counter() - start, _status_code(e))
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self._record("errors")
+                    raise
+
+                attempt += 1
+                self._record("retries")
+                time.sleep(self._backoff_delay(attempt, e))
+                continue
+
+            record_http_call("api.openai.com", time.perf_counter() - start, 200)
+            if not kwargs.get("stream"):
+                record_llm_usage(result, kwargs.get("model"))
+            return result
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter keeps concurrent retries from hitting the API in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _submit(self, call, kwargs: Dict[str, Any], priority: str) -> Future:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITIES)}")
+
+        self._ensure_workers()
+        future = Future()
+        context = contextvars.copy_context()
+        self._queue.put((PRIORITIES[priority], next(self._sequence), future, context, call, kwargs))
+        return future
+
+    def submit(self, priority: str = "interactive", coalesce: bool = True, **kwargs) -> Future:
+        """
+        Queues a chat completion and returns a concurrent.futures.Future for its response.
+        With coalesce=True a request identical to one already in flight (same canonical messages,
+        model, temperature and other settings) joins that call instead of issuing a new one.
+        """
+        def start():
+            return self._submit(self._create_completion, kwargs, priority)
+
+        if not coalesce:
+            return start()
+
+        messages = kwargs.get("messages", [])
+        settings = {key: value for key, value in kwargs.items() if key != "messages"}
+        return self.single_flight.submit(make_cache_key(messages, **settings), start)
+
+    def chat_completion(self, priority: str = "interactive", coalesce: bool = True, **kwargs):
+        """Synchronous chat completion; accepts the same keyword arguments as chat.completions.create."""
+        return self.submit(priority=priority, coalesce=coalesce, **kwargs).result()
+
+    async def achat_completion(self, priority: str = "interactive", coalesce: bool = True, **kwargs):
+        """Asynchronous chat completion; accepts the same keyword arguments as chat.completions.create."""
+        future = self.submit(priority=priority, coalesce=coalesce, **kwargs)
+        # Shield the shared future so a cancelled task does not cancel the call for other waiters
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _open_stream(self, priority: str, kwargs: Dict[str, Any]) -> Future:
+        # Only opening the stream goes through the worker pool; the caller consumes the chunks,
+        # so long generations do not hold a worker
+        kwargs = {**kwargs, "stream": True}
+        return self._submit(self._create_stream, kwargs, priority)
+
+    def _create_completion(self, **kwargs):
+        cassette = get_cassette()
+        create = lambda: self._get_client().chat.completions.create(**kwargs)
+        return cassette.chat_completion(create, kwargs) if cassette else create()
+
+    def _create_stream(self, **kwargs):
+        cassette = get_cassette()
+        create = lambda: self._get_client().chat.completions.create(**kwargs)
+        return cassette.stream_chat_completion(create, kwargs) if cassette else create()
+
+    def upload_file(self, path: str, purpose: str = "assistants") -> str:
+        """Uploads a file to the Files API with rate limiting and retries and returns its id."""
+        def upload():
+            with open(path, "rb") as f:
+                return self._get_client().files.create(file=f, purpose=purpose)
+
+        cassette = get_cassette()
+        if cassette:
+            with open(path, "rb") as f:
+                content = f.read()
+            return cassette.upload_file(lambda: self._call_with_retry(upload, {}), content, purpose)
+
+        return self._call_with_retry(upload, {}).id
+
+    def stream_chat_completion(
+        self, priority: str = "interactive", stats: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Iterator[str]:
+        """
+        Streams a chat completion and yields content deltas as they arrive.
+        If a stats dict is given it is filled with time_to_first_token, total_time and chunks (seconds/count).
+        """
+        stats = stats if stats is not None else {}
+        start = time.perf_counter()
+        stats.update({"time_to_first_token": None, "total_time": None, "chunks": 0})
+
+        stream = self._open_stream(priority, kwargs).result()
+        for chunk in stream:
+            delta = _chunk_content(chunk)
+            if not delta:
+                continue
+            if stats["time_to_first_token"] is None:
+                stats["time_to_first_token"] = time.perf_counter() - start
+            stats["chunks"] += 1
+            yield delta
+
+        stats["total_time"] = time.perf_counter() - start
+
+    async def astream_chat_completion(
+        self, priority: str = "interactive", stats: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> AsyncIterator[str]:
+        """Asynchronous version of stream_chat_completion."""
+        stats = stats if stats is not None else {}
+        start = time.perf_counter()
+        stats.update({"time_to_first_token": None, "total_time": None, "chunks": 0})
+
+        stream = await asyncio.wrap_future(self._open_stream(priority, kwargs))
+        chunks = iter(stream)
+        while True:
+            # The client stream is blocking, so each read happens off the event loop
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            delta = _chunk_content(chunk)
+            if not delta:
+                continue
+            if stats["time_to_first_token"] is None:
+                stats["time_to_first_token"] = time.perf_counter() - start
+            stats["chunks"] += 1
+            yield delta
+
+        stats["total_time"] = time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["workers"] = len(self._workers)
+        stats.update(self.single_flight.stats())
+        return stats
+
+
+def _chunk_content(chunk) -> str:
+    if not getattr(chunk, "choices", None):
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)
+    return status
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    # Connection failures and timeouts carry no status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "Timeout", "ConnectionError")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Returns the process-wide gateway, created from gateway_config on first use."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(**gateway_config)
+        return _gateway
+
+
+def set_gateway_config(config: Dict[str, Any]) -> None:
+    global gateway_config, _gateway
+    with _gateway_lock:
+        gateway_config = {**gateway_config, **config}
+        _gateway = None
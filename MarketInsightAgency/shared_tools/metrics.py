@@ -0,0 +1,289 @@
+import bisect
+import contextvars
+import functools
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Metrics settings, overridable through environment variables. When disabled, tools are not wrapped
+# and the registry drops every sample, so callers can record unconditionally.
+metrics_config = {
+    "enabled": os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes"),
+    "port": int(os.getenv("METRICS_PORT", 0)),
+    "dump_path": os.getenv("METRICS_DUMP_PATH", ""),
+    "dump_interval": float(os.getenv("METRICS_DUMP_INTERVAL", 60)),
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, math.inf)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, math.inf)
+
+# (tool, agent) of the tool run currently executing in this context, used to attribute LLM and HTTP calls
+current_tool: contextvars.ContextVar = contextvars.ContextVar("current_tool", default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": {_format_bound(b): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters and histograms, exportable as Prometheus text or JSON.
+    inc() and observe() do nothing while metrics are disabled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not metrics_config["enabled"]:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Iterable[float] = DEFAULT_BUCKETS, **labels):
+        if not metrics_config["enabled"]:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self._buckets.setdefault(name, tuple(buckets)))
+            series[key].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        labels = _format_labels(key + (("le", _format_bound(bound)),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _tool_labels() -> Dict[str, str]:
+    tool, agent = current_tool.get() or ("none", "none")
+    return {"tool": tool, "agent": agent}
+
+
+def instrument_tool(tool_class, agent_name: Optional[str] = None):
+    """
+    Wraps tool_class.run to record wall time, CPU time, bytes in/out and exceptions per tool and agent.
+    The calling agent is read from the _caller_agent attribute agency_swarm sets before each run.
+    """
+    run = tool_class.run
+    if getattr(run, "_metrics_instrumented", False):
+        return tool_class
+
+    @functools.wraps(run)
+    def instrumented_run(self, *args, **kwargs):
+        caller = getattr(self, "_caller_agent", None)
+        labels = {"tool": tool_class.__name__, "agent": getattr(caller, "name", None) or agent_name or "none"}
+        token = current_tool.set((labels["tool"], labels["agent"]))
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            result = run(self, *args, **kwargs)
+        except Exception as e:
+            registry.inc("tool_exceptions_total", exception=type(e).__name__, **labels)
+            raise
+        finally:
+            registry.observe("tool_wall_seconds", time.perf_counter() - wall_start, **labels)
+            registry.observe("tool_cpu_seconds", time.thread_time() - cpu_start, **labels)
+            registry.inc("tool_runs_total", **labels)
+            current_tool.reset(token)
+
+        registry.observe("tool_bytes_in", len(self.model_dump_json()), buckets=BYTES_BUCKETS, **labels)
+        registry.observe("tool_bytes_out", len(str(result)), buckets=BYTES_BUCKETS, **labels)
+        return result
+
+    instrumented_run._metrics_instrumented = True
+    tool_class.run = instrumented_run
+    return tool_class
+
+
+def instrument_agents(agents) -> None:
+    """Instruments every tool class used by the given agents."""
+    for agent in agents:
+        for tool in getattr(agent, "tools", []) or []:
+            if isinstance(tool, type) and hasattr(tool, "run"):
+                instrument_tool(tool, agent.name)
+
+
+def record_llm_usage(response, model: Optional[str] = None) -> None:
+    """Counts prompt/completion tokens of an LLM response against the tool currently running."""
+    if not metrics_config["enabled"]:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    labels = {**_tool_labels(), "model": model or getattr(response, "model", "unknown")}
+    registry.inc("llm_prompt_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, **labels)
+    registry.inc("llm_completion_tokens_total", getattr(usage, "completion_tokens", 0) or 0, **labels)
+
+
+def record_http_call(host: str, duration: float, status: Any = None) -> None:
+    """Counts an outbound HTTP call and its latency against the tool currently running."""
+    if not metrics_config["enabled"]:
+        return
+    labels = _tool_labels()
+    registry.inc("http_calls_total", host=host, status=status if status is not None else "error", **labels)
+    registry.observe("http_call_seconds", duration, host=host)
+
+
+# The metrics server and dump thread are process-wide, while agencies may be built many times
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body = registry.to_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body = json.dumps(registry.to_dict()).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def dump_metrics(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(registry.to_dict(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def start_periodic_dump(path: str, interval: float = 60) -> threading.Thread:
+    """Writes the registry as JSON to path every interval seconds from a daemon thread."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                dump_metrics(path)
+            except Exception as e:
+                print(f"Error writing metrics dump: {str(e)}")
+
+    thread = threading.Thread(target=loop, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_exporters() -> None:
+    """Starts the configured metrics server and periodic dump, once per process however often it is called."""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    if metrics_config["port"]:
+        start_metrics_server(metrics_config["port"])
+        print(f"Metrics available at http://localhost:{metrics_config['port']}/metrics")
+    if metrics_config["dump_path"]:
+        start_periodic_dump(metrics_config["dump_path"], metrics_config["dump_interval"])
+
+
+def setup_metrics(agents) -> None:
+    """
+    Instruments the agents' tools and starts the configured exporters when metrics are enabled. Safe to call
+    for every agency built in the process: tools are instrumented per agency, the exporters only once.
+    """
+    if not metrics_config["enabled"]:
+        return
+    instrument_agents(agents)
+    start_exporters()
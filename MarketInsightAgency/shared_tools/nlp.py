@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_sentiment_analyzer():
+    """
+    Returns a shared NLTK SentimentIntensityAnalyzer, downloading the VADER lexicon only if it is missing.
+    nltk is imported here rather than at module level so loading the tools stays cheap.
+    """
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        nltk.download("vader_lexicon", quiet=True)
+
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def get_spacy_model(name: str = "en_core_web_sm"):
+    """Loads a spaCy pipeline once per process."""
+    import spacy
+
+    return spacy.load(name)
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Default cache settings, overridable through environment variables
+cache_config = {
+    "cache_dir": os.getenv("AI_CACHE_DIR", "./.cache/ai_responses"),
+    "ttl": int(os.getenv("AI_CACHE_TTL", 24 * 60 * 60)),
+    "max_entries": int(os.getenv("AI_CACHE_MAX_ENTRIES", 5000)),
+    "enabled": os.getenv("AI_CACHE_ENABLED", "true").lower() not in ("0", "false", "no"),
+}
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def make_cache_key(messages: List[Dict[str, Any]], **settings) -> str:
+    """
+    Builds a content-addressed key from the full message list and generation settings.
+    Dictionaries are serialized with sorted keys so equivalent requests hash identically.
+    """
+    payload = {"messages": messages, "settings": settings}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Disk-backed SQLite cache for model responses with TTL expiry and LRU eviction.
+    Safe to share between threads; every operation opens its own short-lived connection.
+    """
+
+    def __init__(self, path: str, ttl: int = 24 * 60 * 60, max_entries: int = 5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
+        """Returns the cached payload for key, or None if it is missing or expired. ttl overrides the cache's TTL."""
+        entry = self.lookup(key, ttl=ttl)
+        return entry["payload"] if entry else None
+
+    def lookup(self, key: str, ttl: Optional[int] = None, stale_ttl: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Returns {"payload", "age", "stale"} for key, or None if it is missing. An entry older than ttl (the cache's
+        TTL unless given) is still returned with stale=True for another stale_ttl seconds, so the caller can serve
+        it while refreshing it; after that it is deleted.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            age = now - row[1] if row is not None else 0.0
+            if row is None or (ttl and age > ttl + stale_ttl):
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            stale = bool(ttl) and age > ttl
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+
+        return {"payload": json.loads(row[0]), "age": age, "stale": stale}
+
+    def set(self, key: str, payload: Any) -> None:
+        """Stores payload under key and evicts the least recently used entries above max_entries."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), now, now)
+            )
+            if self.max_entries:
+                conn.execute(
+                    """DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / total if total else 0.0,
+            "entries": entries,
+        }
+
+
+def get_response_cache(name: str = "responses", ttl: Optional[int] = None, max_entries: Optional[int] = None) -> ResponseCache:
+    """
+    Returns the process-wide cache stored as <cache_dir>/<name>.sqlite. ttl and max_entries default to the
+    cache config and only apply when the cache is first created.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = ResponseCache(
+                os.path.join(cache_config["cache_dir"], f"{name}.sqlite"),
+                ttl=cache_config["ttl"] if ttl is None else ttl,
+                max_entries=cache_config["max_entries"] if max_entries is None else max_entries,
+            )
+        return _caches[name]
+
+
+def set_cache_config(config: Dict[str, Any]) -> None:
+    global cache_config
+    cache_config = {**cache_config, **config}
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one upstream call.
+    The first caller starts the work and every caller with the same key receives the same
+    concurrent.futures.Future, so threads can block on .result() and asyncio tasks can await
+    it through asyncio.wrap_future. The key is forgotten as soon as the call completes.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def submit(self, key: str, start: Callable[[], Future]) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.collapsed += 1
+                return future
+
+            self.calls += 1
+            future = start()
+            self._inflight[key] = future
+
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._inflight)
+        return {
+            "upstream_calls": self.calls,
+            "collapsed_calls": self.collapsed,
+            "in_flight": in_flight,
+        }
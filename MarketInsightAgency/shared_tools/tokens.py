@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_encodings = {}
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """
+    Counts tokens with tiktoken when it is installed, otherwise estimates ~4 characters per token.
+    """
+    if not text:
+        return 0
+
+    if model not in _encodings:
+        _encodings[model] = _load_encoding(model)
+
+    encoding = _encodings[model]
+    if encoding is None:
+        return max(1, len(text) // 4)
+
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _load_encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encodings are downloaded on first use, which fails on offline machines
+        return None
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: str = "gpt-4") -> int:
+    """Estimates the prompt tokens of a chat message list, including multimodal content parts."""
+    total = 0
+    for message in messages:
+        # Every message carries a few tokens of role/formatting overhead
+        total += 4
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            total += count_tokens(content, model)
+            continue
+
+        for part in content:
+            if part.get("type") == "text":
+                total += count_tokens(part.get("text", ""), model)
+            elif part.get("type") in ("image_url", "image_file"):
+                detail = (part.get("image_url") or {}).get("detail", "auto")
+                total += 85 if detail == "low" else 765
+    return total
+
+
+def chunk_text(text: str, max_tokens: int, model: str = "gpt-4") -> List[str]:
+    """
+    Splits text into chunks of at most max_tokens, preferring structural boundaries:
+    blank-line separated blocks first, then lines, then sentences, and words only as a last resort.
+    Pieces are joined back with the separator they were split on, which counts towards the budget.
+    """
+    chunks = []
+    current = ""
+    current_tokens = 0
+
+    for separator, piece in _split_structural(text, max_tokens, model, ("\n\n", "\n", ". ", " ")):
+        piece_tokens = count_tokens(piece, model)
+        if current:
+            joined = current + separator + piece
+            joined_tokens = current_tokens + count_tokens(separator, model) + piece_tokens
+            if joined_tokens > max_tokens or _encodings.get(model) is None:
+                # Summed tiktoken counts overestimate, since tokens merge across the join, so the joined chunk
+                # is only counted before starting a new one. Character estimates round per piece and are
+                # cheap, so they are always taken on the whole chunk.
+                joined_tokens = count_tokens(joined, model)
+            if joined_tokens <= max_tokens:
+                current = joined
+                current_tokens = joined_tokens
+                continue
+            chunks.append(current)
+        current = piece
+        current_tokens = piece_tokens
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _split_structural(text: str, max_tokens: int, model: str, separators,
+                      joiner: str = "\n\n") -> List[Tuple[str, str]]:
+    """
+    Recursively splits text on the coarsest separator that keeps every piece within max_tokens.
+    Returns (separator, piece) pairs, where separator joins the piece to the one before it; the first
+    piece gets joiner, the separator text itself was split on by the caller.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if count_tokens(text, model) <= max_tokens or not separators:
+        return [(joiner, text)]
+
+    separator, rest = separators[0], separators[1:]
+    pieces = []
+    parts = text.split(separator)
+    for index, part in enumerate(parts):
+        if separator == ". " and index < len(parts) - 1:
+            # The period stays with the sentence; only the space joins sentences again
+            part += "."
+        if not part.strip():
+            continue
+        part_joiner = joiner if not pieces else (" " if separator == ". " else separator)
+        pieces.extend(_split_structural(part, max_tokens, model, rest, part_joiner))
+    return pieces
@@ -5,6 +5,31 @@ export async function POST(request) {
     const body = await request.json();
     const { messages } = body;
 
+    // Forward to the Python agency server and pass its event stream through unchanged
+    const agencyApiUrl = process.env.AGENCY_API_URL;
+    if (agencyApiUrl) {
+      const upstream = await fetch(`${agencyApiUrl}/chat`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ messages, session_id: body.session_id }),
+      });
+
+      if (!upstream.ok) {
+        return NextResponse.json(
+          { error: await upstream.text() || 'Agency request failed' },
+          { status: upstream.status }
+        );
+      }
+
+      return new Response(upstream.body, {
+        headers: {
+          'Content-Type': 'text/event-stream',
+          'Cache-Control': 'no-cache',
+          'Connection': 'keep-alive',
+        },
+      });
+    }
+
     const apiUrl = process.env.GROQ_API_URL || 'https://api.groq.com/openai/v1/chat/completions';
     const apiKey = process.env.GROQ_API_KEY;
 